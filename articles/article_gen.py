@@ -16,6 +16,12 @@ from lang_detect import detect_language, lang_instruction
 
 logger = logging.getLogger(__name__)
 
+# LLM replies sometimes wrap the JSON in a markdown fence or add a line of
+# prose around it; parsing starts at the first "{" and raw_decode() ignores
+# anything after the object, so neither needs exact stripping.
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_json_decoder = json.JSONDecoder()
+
 
 def _sanitize_topic(topic: str) -> str:
     """APP-06: Sanitize user topic input before passing to LLM.
@@ -118,7 +124,6 @@ def _build_prompt(topic: str) -> str:
     if _is_url(topic):
         try:
             title, text = _fetch_url_text(topic)
-            from lang_detect import detect_language, lang_instruction
             lang_extra = lang_instruction(detect_language(text[:500]))
             safe_title = _sanitize_topic(title)
             # Truncate page text to prevent prompt stuffing
@@ -131,7 +136,6 @@ def _build_prompt(topic: str) -> str:
             )
         except Exception as e:
             logger.warning(f"URL fetch failed, treating as topic: {e}")
-    from lang_detect import detect_language, lang_instruction
     safe = _sanitize_topic(topic)
     return f"Write an encyclopedia article about the following topic:\n<topic>{safe}</topic>" + lang_instruction(detect_language(safe))
 
@@ -139,18 +143,21 @@ def generate_article(topic: str) -> Dict[str, Any]:
     """Generate a full article for a topic. Returns {title, sections}."""
     safe_topic = _sanitize_topic(topic)
     raw = complete(
-        prompt=_build_prompt(safe_topic) + lang_instruction(detect_language(safe_topic)),
+        # _build_prompt already appends the language instruction (from the
+        # page text for URLs), so it is not added a second time here.
+        prompt=_build_prompt(safe_topic),
         system=ARTICLE_SYSTEM,
         max_tokens=6144,
         temperature=0.4,
     )
 
-    # Clean markdown fences
-    content = re.sub(r'^```json\s*|\s*```$', '', raw).strip()
-    content = re.sub(r',\s*([}\]])', r'\1', content)
+    # Skip any fence / preamble before the object and drop trailing commas
+    start = raw.find("{")
+    content = raw[start:] if start >= 0 else raw.strip()
+    content = _TRAILING_COMMA_RE.sub(r'\1', content)
 
     try:
-        parsed = json.loads(content)
+        parsed, _ = _json_decoder.raw_decode(content)
     except json.JSONDecodeError as e:
         logger.warning("Article JSON parse error: %s", e)
         parsed = _try_repair(content)
@@ -207,6 +214,8 @@ def split_into_sentences(text: str) -> List[str]:
 
 
 def _try_repair(content: str):
+    # A truncated reply may still end in a closing fence; drop it first
+    content = content.rstrip().removesuffix("```").rstrip()
     repairs = [
         content + ']}',
         content + '"]}',
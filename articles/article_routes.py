@@ -63,24 +63,25 @@ def _enrich_sentences(article: dict, db=None) -> dict:
         _owns = False
 
     try:
-        from chain.chain_db import get_stake_totals, get_verity_score
-        for section in article.get("sections", []):
-            for sent in section.get("sentences", []):
-                pid = sent.get("post_id")
-                if pid is not None:
-                    try:
-                        s, ch = get_stake_totals(db, pid)
-                        sent["stake_support"] = s
-                        sent["stake_challenge"] = ch
-                        sent["verity_score"] = get_verity_score(db, pid)
-                    except Exception:
-                        sent["stake_support"] = 0
-                        sent["stake_challenge"] = 0
-                        sent["verity_score"] = 0
-                else:
-                    sent["stake_support"] = 0
-                    sent["stake_challenge"] = 0
-                    sent["verity_score"] = 0
+        from chain.chain_db import get_post_states
+        sents = [sent for section in article.get("sections", [])
+                 for sent in section.get("sentences", [])]
+        try:
+            states = get_post_states(
+                db, [s["post_id"] for s in sents if s.get("post_id") is not None])
+        except Exception:
+            states = {}
+        for sent in sents:
+            pid = sent.get("post_id")
+            if pid is not None:
+                s, ch, vs = states.get(int(pid), (0.0, 0.0, 0.0))
+                sent["stake_support"] = s
+                sent["stake_challenge"] = ch
+                sent["verity_score"] = vs
+            else:
+                sent["stake_support"] = 0
+                sent["stake_challenge"] = 0
+                sent["verity_score"] = 0
     finally:
         if _owns:
             db.close()
@@ -715,7 +716,7 @@ def detect_topic_endpoint(req: DetectTopicRequest, db: Session = Depends(get_db)
     Returns immediately with the detected topic."""
     from articles.topic_detect import detect_topic, ensure_article_for_claim
 
-    topic = detect_topic(req.claim_text)
+    topic = detect_topic(req.claim_text, db)
     if not topic:
         return {"topic": None, "status": "detection_failed"}
 
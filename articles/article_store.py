@@ -9,6 +9,8 @@ import json
 import logging
 import re
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
 
 from sqlalchemy.orm import Session
@@ -16,12 +18,26 @@ from sqlalchemy import text as sql_text
 
 logger = logging.getLogger(__name__)
 
+# Embedding calls in build_and_cache_response that don't touch the DB
+# session run here, overlapping the session-bound work on the caller.
+_embed_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="article-embed")
+
 
 def _norm(topic: str) -> str:
     t = unicodedata.normalize("NFC", topic.strip().lower())
     return re.sub(r"\s+", " ", t)
 
 
+_HEADING_STOP = frozenset({"and", "the", "of", "in", "a", "an"})
+
+
+@lru_cache(maxsize=4096)
+def _heading_words(heading: str) -> frozenset:
+    """Content words of a normalized heading, for the word-overlap match.
+    Cached: every fresh heading is compared against every existing one."""
+    return frozenset(heading.split()) - _HEADING_STOP
+
+
 # ── Schema ──────────────────────────────────────────────
 
 def ensure_tables(db: Session):
@@ -440,9 +456,9 @@ def refresh_article(db: Session, topic: str) -> bool:
                 pass
             if not matched_section:
                 # Word overlap fallback
-                h_words = set(heading_key.split()) - {"and", "the", "of", "in", "a", "an"}
+                h_words = _heading_words(heading_key)
                 for existing_h, sec_id in existing_sections.items():
-                    e_words = set(existing_h.split()) - {"and", "the", "of", "in", "a", "an"}
+                    e_words = _heading_words(existing_h)
                     overlap = len(h_words & e_words)
                     min_len = min(len(h_words), len(e_words))
                     if min_len > 0 and overlap / min_len >= 0.5 and overlap >= 2:
@@ -548,6 +564,8 @@ def _reassign_sentences_to_best_sections(db, article_id: int):
         def _parse_pgvec(s):
             if s is None:
                 return None
+            if isinstance(s, list):
+                return s
             s = s.strip()
             if not s.startswith("[") or not s.endswith("]"):
                 return None
@@ -561,7 +579,7 @@ def _reassign_sentences_to_best_sections(db, article_id: int):
 
         # Re-fetch including cached embeddings.
         sent_rows = db.execute(sql_text(
-            "SELECT s.sentence_id, s.section_id, s.text, s.embedding::text "
+            "SELECT s.sentence_id, s.section_id, s.text, s.embedding::real[] "
             "FROM article_sentence s "
             "JOIN article_section sec ON s.section_id = sec.section_id "
             "WHERE sec.article_id = :a AND s.is_hidden = FALSE"
@@ -738,27 +756,45 @@ def build_and_cache_response(db_or_factory, topic_key: str):
         seen_groups = set()
         seen_pids = set()
 
+        # Group and stake rows for every pid come back in one query, and
+        # the members of every multi-member group in a second, instead of
+        # up to three round trips per pid inside the loop.
+        row_by_pid = {}
+        members_by_group = {}
+        if onchain_pids:
+            for r in db.execute(sql_text(
+                "SELECT ct.post_id, ct.dupe_group_id, g.canonical_post_id, g.canonical_text, "
+                "       g.total_support, g.total_challenge, g.aggregate_vs, g.member_count, "
+                "       ct.claim_text, COALESCE(p.support_total,0), "
+                "       COALESCE(p.challenge_total,0), COALESCE(p.effective_vs,0) "
+                "FROM chain_claim_text ct "
+                "LEFT JOIN claim_dupe_group g ON ct.dupe_group_id = g.group_id "
+                "LEFT JOIN chain_post p ON ct.post_id = p.post_id "
+                "WHERE ct.post_id = ANY(:pids)"
+            ), {"pids": list(onchain_pids)}).fetchall():
+                row_by_pid[r[0]] = r
+            group_ids = list({
+                r[1] for r in row_by_pid.values() if r[1] and r[7] and r[7] > 1
+            })
+            if group_ids:
+                for gid, mp in db.execute(sql_text(
+                    "SELECT dupe_group_id, post_id FROM chain_claim_text "
+                    "WHERE dupe_group_id = ANY(:gids)"
+                ), {"gids": group_ids}).fetchall():
+                    members_by_group.setdefault(gid, []).append(mp)
+
         for pid in onchain_pids:
             if pid in seen_pids:
                 continue
+            r = row_by_pid.get(pid)
             # Check dupe group
-            dg = db.execute(sql_text(
-                "SELECT ct.dupe_group_id, g.canonical_post_id, g.canonical_text, "
-                "       g.total_support, g.total_challenge, g.aggregate_vs, g.member_count "
-                "FROM chain_claim_text ct "
-                "LEFT JOIN claim_dupe_group g ON ct.dupe_group_id = g.group_id "
-                "WHERE ct.post_id = :pid"
-            ), {"pid": pid}).fetchone()
+            dg = r[1:8] if r else None
 
             if dg and dg[0] and dg[0] not in seen_groups and dg[6] and dg[6] > 1:
                 # Multi-member group: use canonical as master
                 group_id = dg[0]
                 seen_groups.add(group_id)
-                # Get all member pids
-                members = db.execute(sql_text(
-                    "SELECT post_id FROM chain_claim_text WHERE dupe_group_id = :gid"
-                ), {"gid": group_id}).fetchall()
-                member_pids = [m[0] for m in members]
+                member_pids = members_by_group.get(group_id, [])
                 for mp in member_pids:
                     seen_pids.add(mp)
                 master_claims.append({
@@ -774,23 +810,16 @@ def build_and_cache_response(db_or_factory, topic_key: str):
             else:
                 # Singleton or no group
                 seen_pids.add(pid)
-                info = db.execute(sql_text(
-                    "SELECT ct.claim_text, COALESCE(p.support_total,0), "
-                    "       COALESCE(p.challenge_total,0), COALESCE(p.effective_vs,0) "
-                    "FROM chain_claim_text ct "
-                    "LEFT JOIN chain_post p ON ct.post_id = p.post_id "
-                    "WHERE ct.post_id = :pid"
-                ), {"pid": pid}).fetchone()
-                if info:
+                if r:
                     master_claims.append({
                         "post_id": pid,
-                        "text": info[0],
-                        "group_id": dg[0] if dg else None,
+                        "text": r[8],
+                        "group_id": dg[0],
                         "member_pids": [pid],
                         "member_count": 1,
-                        "support": info[1],
-                        "challenge": info[2],
-                        "vs": info[3],
+                        "support": r[9],
+                        "challenge": r[10],
+                        "vs": r[11],
                     })
 
         # ── Step 3: For each master, hide similar off-chain, ensure placed ──
@@ -810,10 +839,13 @@ def build_and_cache_response(db_or_factory, topic_key: str):
 
         SIMILARITY_THRESHOLD = 0.80
 
-        # Helpers shared with persist_dedup() — pgvector text-format I/O.
+        # Helpers shared with persist_dedup() — pgvector I/O (reads come
+        # back as real[] lists; writes go out as vector text).
         def _parse_pgvec(s):
             if s is None:
                 return None
+            if isinstance(s, list):
+                return s
             s = s.strip()
             if not s.startswith("[") or not s.endswith("]"):
                 return None
@@ -825,14 +857,38 @@ def build_and_cache_response(db_or_factory, topic_key: str):
         def _fmt_pgvec(v):
             return "[" + ",".join(repr(float(x)) for x in v) + "]"
 
+        # Master and section texts are embedded on _embed_pool while the
+        # sentence-vector preload below runs its DB reads (and any
+        # embed_batch for cache misses) here; the three share no data, so
+        # their latencies overlap instead of adding up.
+        master_vecs_future = None
+        section_vecs_future = None
+        section_ids_in_order = []
+        if embed_batch and master_claims:
+            master_vecs_future = _embed_pool.submit(
+                embed_batch, [m["text"] for m in master_claims])
+            if sections:
+                section_texts_in_order = []
+                for sec_id, sec_data in sections.items():
+                    sec_text = sec_data["heading"] + ". " + " ".join(
+                        s["text"] for s in sec_data["sentences"][:8]
+                    )
+                    section_ids_in_order.append(sec_id)
+                    section_texts_in_order.append(sec_text)
+                section_vecs_future = _embed_pool.submit(
+                    embed_batch, section_texts_in_order)
+
         # Build sentence_vec_by_id: { sentence_id: list[float] } for every
         # off-chain sentence in this article. Reads cached embeddings;
         # batches a single embed_batch() call for any that are missing.
+        #
+        # Sentence and section vectors only feed the master loop below, so
+        # a topic with no on-chain claims skips both preloads outright.
         sentence_vec_by_id = {}
-        if embed_batch and cosine_similarity:
+        if embed_batch and cosine_similarity and master_claims:
             try:
                 rows = db.execute(sql_text(
-                    "SELECT s.sentence_id, s.text, s.embedding::text "
+                    "SELECT s.sentence_id, s.text, s.embedding::real[] "
                     "FROM article_sentence s "
                     "JOIN article_section sec ON s.section_id = sec.section_id "
                     "WHERE sec.article_id = :a "
@@ -899,10 +955,9 @@ def build_and_cache_response(db_or_factory, topic_key: str):
         # Batch-embed all master texts. master_vec_by_pid is in-memory only
         # (masters are derived from current on-chain state, not cached).
         master_vec_by_pid = {}
-        if embed_batch and master_claims:
+        if master_vecs_future is not None:
             try:
-                texts = [m["text"] for m in master_claims]
-                vecs = embed_batch(texts)
+                vecs = master_vecs_future.result()
                 for m, v in zip(master_claims, vecs):
                     master_vec_by_pid[int(m["post_id"])] = v
             except Exception as e:
@@ -915,20 +970,11 @@ def build_and_cache_response(db_or_factory, topic_key: str):
         # across all unplaced masters in this rebuild. Section content
         # doesn't change between iterations.
         section_vec_by_id = {}
-        if embed_batch and sections:
+        if section_vecs_future is not None:
             try:
-                section_texts_in_order = []
-                section_ids_in_order = []
-                for sec_id, sec_data in sections.items():
-                    sec_text = sec_data["heading"] + ". " + " ".join(
-                        s["text"] for s in sec_data["sentences"][:8]
-                    )
-                    section_ids_in_order.append(sec_id)
-                    section_texts_in_order.append(sec_text)
-                if section_texts_in_order:
-                    sec_vecs = embed_batch(section_texts_in_order)
-                    for sid, v in zip(section_ids_in_order, sec_vecs):
-                        section_vec_by_id[sid] = v
+                sec_vecs = section_vecs_future.result()
+                for sid, v in zip(section_ids_in_order, sec_vecs):
+                    section_vec_by_id[sid] = v
             except Exception as e:
                 logger.debug(
                     "build_and_cache_response: section-vec preload failed (%s); find_best_section will self-embed",
@@ -1040,6 +1086,28 @@ def build_and_cache_response(db_or_factory, topic_key: str):
         db.commit()
 
         # ── Step 4: Rebuild article dict with cleaned data ──
+        # VS/stake and dupe-group info for every visible on-chain sentence,
+        # fetched up front in two queries instead of three per sentence.
+        from chain.chain_db import get_post_states
+        visible_pids = {
+            int(s["post_id"])
+            for sec in sections.values() for s in sec["sentences"]
+            if not s.get("_hidden") and s.get("post_id") is not None
+        }
+        try:
+            post_states = get_post_states(db, visible_pids)
+        except Exception:
+            post_states = {}
+        dupe_by_pid = {}
+        if visible_pids:
+            for r in db.execute(sql_text(
+                "SELECT ct.post_id, ct.dupe_group_id, g.member_count "
+                "FROM chain_claim_text ct "
+                "LEFT JOIN claim_dupe_group g ON ct.dupe_group_id = g.group_id "
+                "WHERE ct.post_id = ANY(:ids)"
+            ), {"ids": list(visible_pids)}).fetchall():
+                dupe_by_pid[int(r[0])] = (r[1], r[2])
+
         # Remove hidden sentences and empty sections
         result_sections = []
         for sec_id in [s[0] for s in secs]:  # preserve original order
@@ -1051,32 +1119,21 @@ def build_and_cache_response(db_or_factory, topic_key: str):
                 continue
 
             # Enrich with VS/stake from DB
-            from chain.chain_db import get_stake_totals, get_verity_score
             for s in clean_sents:
                 pid = s.get("post_id")
                 if pid is not None:
-                    try:
-                        sup, chal = get_stake_totals(db, pid)
-                        s["stake_support"] = sup
-                        s["stake_challenge"] = chal
-                        s["verity_score"] = get_verity_score(db, pid)
-                    except Exception:
-                        s["stake_support"] = 0
-                        s["stake_challenge"] = 0
-                        s["verity_score"] = 0
+                    sup, chal, vs = post_states.get(int(pid), (0.0, 0.0, 0.0))
+                    s["stake_support"] = sup
+                    s["stake_challenge"] = chal
+                    s["verity_score"] = vs
                 else:
                     s["stake_support"] = 0
                     s["stake_challenge"] = 0
                     s["verity_score"] = 0
 
                 # Add dupe group info for frontend rollup
-                if pid and s.get("post_id"):
-                    dg_row = db.execute(sql_text(
-                        "SELECT ct.dupe_group_id, g.member_count "
-                        "FROM chain_claim_text ct "
-                        "LEFT JOIN claim_dupe_group g ON ct.dupe_group_id = g.group_id "
-                        "WHERE ct.post_id = :pid"
-                    ), {"pid": pid}).fetchone()
+                if pid:
+                    dg_row = dupe_by_pid.get(int(pid))
                     if dg_row and dg_row[0]:
                         s["dupe_group_id"] = dg_row[0]
                         if dg_row[1] and dg_row[1] > 1:
@@ -1302,11 +1359,11 @@ def persist_dedup(db, article_id: int):
     from sqlalchemy import text as sql_text
     logger = logging.getLogger(__name__)
     try:
-        # Step 1: load all non-hidden sentences. Cast embedding to text so
-        # SQLAlchemy returns it as a string we can parse, since pgvector's
-        # default Python adapter isn't installed.
+        # Step 1: load all non-hidden sentences. pgvector's Python adapter
+        # isn't installed, so the embedding is cast to real[]; psycopg2
+        # parses float arrays in C, which beats splitting vector text here.
         rows = db.execute(sql_text(
-            "SELECT s.sentence_id, s.text, s.post_id, s.embedding::text "
+            "SELECT s.sentence_id, s.text, s.post_id, s.embedding::real[] "
             "FROM article_sentence s "
             "JOIN article_section sec ON s.section_id = sec.section_id "
             "WHERE sec.article_id = :a AND s.is_hidden = FALSE "
@@ -1320,6 +1377,8 @@ def persist_dedup(db, article_id: int):
         def _parse_vec(s):
             if s is None:
                 return None
+            if isinstance(s, list):
+                return s
             s = s.strip()
             if not s.startswith("["):
                 return None
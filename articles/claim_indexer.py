@@ -9,6 +9,7 @@ Uses simple stem-word overlap for matching — no embedding dependency.
 """
 import re
 import logging
+from functools import lru_cache
 from typing import Set, Dict, Any, List, Optional
 
 from sqlalchemy.orm import Session
@@ -39,21 +40,29 @@ _STOP = {"a","an","the","is","are","was","were","be","been","being","have","has"
          "it","this","that","these","those","than","very","just","also"}
 
 
+_WORD_RE = re.compile(r'[a-zA-Z]{2,}')
+_SUFFIXES = ("ing", "tion", "sion", "ness", "ment", "ity", "ous",
+             "ive", "able", "ible", "ally", "ful", "less", "ly",
+             "ed", "er", "est", "es", "al", "en")
+
+
+@lru_cache(maxsize=16384)
+def _stem(w: str) -> Optional[str]:
+    """Crude stem of one lowercased word, or None for a stop word.
+    Cached: section text repeats the same vocabulary across calls."""
+    if w in _STOP:
+        return None
+    # Crude stemming: strip common suffixes
+    for suffix in _SUFFIXES:
+        if len(w) > len(suffix) + 2 and w.endswith(suffix):
+            return w[:-len(suffix)]
+    return w
+
+
 def _stems(text: str) -> Set[str]:
     """Extract lowercased word stems (crude: strip common suffixes)."""
-    words = re.findall(r'[a-zA-Z]{2,}', text.lower())
-    result = set()
-    for w in words:
-        if w in _STOP:
-            continue
-        # Crude stemming: strip common suffixes
-        for suffix in ("ing", "tion", "sion", "ness", "ment", "ity", "ous",
-                       "ive", "able", "ible", "ally", "ful", "less", "ly",
-                       "ed", "er", "est", "es", "al", "en"):
-            if len(w) > len(suffix) + 2 and w.endswith(suffix):
-                w = w[:-len(suffix)]
-                break
-        result.add(w)
+    result = set(map(_stem, _WORD_RE.findall(text.lower())))
+    result.discard(None)
     return result
 
 
@@ -120,13 +129,17 @@ def find_best_section(
     claim_st = _stems(claim_text)
     if not claim_st:
         return None
+    sents_by_section = {}
+    for sec_id, text in db.execute(sql_text(
+        "SELECT s.section_id, s.text FROM article_sentence s "
+        "JOIN article_section sec ON s.section_id = sec.section_id "
+        "WHERE sec.article_id = :a ORDER BY s.section_id, s.sort_order"
+    ), {"a": article_id}).fetchall():
+        sents_by_section.setdefault(sec_id, []).append(text)
     best_id = None
     best_overlap = 0
     for sec_id, heading in sections:
-        sents = db.execute(sql_text(
-            "SELECT text FROM article_sentence WHERE section_id = :s ORDER BY sort_order"
-        ), {"s": sec_id}).fetchall()
-        sec_st = _section_stems([r[0] for r in sents], heading)
+        sec_st = _section_stems(sents_by_section.get(sec_id, []), heading)
         overlap = len(claim_st & sec_st)
         if overlap > best_overlap:
             best_overlap = overlap
@@ -317,6 +330,11 @@ def index_existing_claims_into_article(db: Session, article_id: int):
     existing_texts = {r[1].lower().strip() for r in sentences}
     existing_pids = {r[2] for r in sentences if r[2] is not None}
 
+    # A sentence's on-chain matches don't depend on which claim is being
+    # placed, so each unlinked sentence is looked up once (lazily) rather
+    # than once per claim.
+    matches_by_sent = {}
+
     indexed_count = 0
 
     for cid, ctext, pid in claims:
@@ -331,7 +349,10 @@ def index_existing_claims_into_article(db: Session, article_id: int):
             if sent_pid is not None:
                 continue
             try:
-                matches = find_all_onchain_matches(db, sent_text, top_k=3)
+                matches = matches_by_sent.get(sent_id)
+                if matches is None:
+                    matches = matches_by_sent[sent_id] = find_all_onchain_matches(
+                        db, sent_text, top_k=3)
                 for m in matches:
                     if m["post_id"] == pid and m["similarity"] >= OVERLAY_THRESHOLD:
                         update_sentence_post_id(db, sent_id, pid)
@@ -23,8 +23,53 @@ encyclopedia topic title that this claim belongs to. The topic should be:
 Return ONLY the topic title, nothing else. No quotes, no explanation."""
 
 
-def detect_topic(claim_text: str) -> Optional[str]:
-    """Detect the best topic for a claim. Returns a short topic string."""
+# A claim this close to one that already has a topic is a restatement of
+# it, so it takes that topic without an LLM round trip.
+TOPIC_REUSE_THRESHOLD = 0.92
+
+# Read-only kNN by the query text's own vector: nothing is inserted for
+# the text being classified. Same shape as semantic._KNN_SQL, so the
+# ORDER BY is an index-orderable "column <=> constant" expression.
+_NEIGHBOR_TOPIC_SQL = sql_text(
+    "SELECT c.topic "
+    "FROM (SELECT e.claim_id, "
+    "        1.0 - (e.embedding <=> CAST(:vec AS vector)) AS similarity "
+    "      FROM claim_embedding e "
+    "      ORDER BY e.embedding <=> CAST(:vec AS vector) "
+    "      LIMIT :k) s "
+    "JOIN claim c USING (claim_id) "
+    "WHERE c.topic IS NOT NULL AND s.similarity >= :min_sim "
+    "ORDER BY s.similarity DESC LIMIT 1"
+)
+
+
+def _neighbor_topic(db: Session, claim_text: str) -> Optional[str]:
+    """Topic of the nearest near-duplicate claim, if any. Never raises.
+    The session is borrowed from the caller, so the query runs inside a
+    savepoint: a failure is undone there without touching the caller's
+    pending work."""
+    try:
+        from embedding import embed
+        vec = "[" + ",".join(repr(float(x)) for x in embed(claim_text)) + "]"
+        with db.begin_nested():
+            row = db.execute(
+                _NEIGHBOR_TOPIC_SQL,
+                {"vec": vec, "k": 5, "min_sim": TOPIC_REUSE_THRESHOLD},
+            ).fetchone()
+        return row[0] if row else None
+    except Exception as e:
+        logger.debug("Neighbor topic lookup failed: %s", e)
+        return None
+
+
+def detect_topic(claim_text: str, db: Optional[Session] = None) -> Optional[str]:
+    """Detect the best topic for a claim. Returns a short topic string.
+    With a db session, near-duplicates of already-topiced claims reuse
+    that topic and skip the LLM."""
+    if db is not None:
+        topic = _neighbor_topic(db, claim_text)
+        if topic:
+            return topic
     try:
         result = complete(
             prompt=f"Claim: {claim_text}",
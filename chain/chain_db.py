@@ -34,6 +34,22 @@ def get_verity_score(db: Session, post_id: int) -> float:
     return 0.0
 
 
+def get_post_states(db: Session, post_ids) -> dict[int, tuple[float, float, float]]:
+    """Bulk get_stake_totals + get_verity_score in one query.
+
+    Returns {post_id: (support, challenge, verity_score)}; posts that are not
+    indexed yet are left out, so callers should default them to zeros.
+    """
+    ids = list({int(p) for p in post_ids})
+    if not ids:
+        return {}
+    rows = db.execute(sql_text(
+        "SELECT post_id, support_total, challenge_total, effective_vs "
+        "FROM chain_post WHERE post_id = ANY(:ids)"
+    ), {"ids": ids}).fetchall()
+    return {int(r[0]): (r[1], r[2], r[3]) for r in rows}
+
+
 def get_user_stake(db: Session, user_address: str, post_id: int, side: int) -> float:
     """Returns user's stake amount from indexed DB."""
     row = db.execute(sql_text(
@@ -45,6 +61,32 @@ def get_user_stake(db: Session, user_address: str, post_id: int, side: int) -> f
     return 0.0
 
 
+def get_claim_state(db: Session, post_id: int, user_address: str | None = None) -> dict:
+    """Returns stake totals, VS and (optionally) the user's stakes in one query.
+
+    Equivalent to get_stake_totals + get_verity_score + 2x get_user_stake.
+    """
+    row = db.execute(sql_text(
+        "SELECT p.support_total, p.challenge_total, p.effective_vs, "
+        "  COALESCE(MAX(u.amount) FILTER (WHERE u.side = 0), 0.0), "
+        "  COALESCE(MAX(u.amount) FILTER (WHERE u.side = 1), 0.0) "
+        "FROM (SELECT :pid AS post_id) q "
+        "LEFT JOIN chain_post p ON p.post_id = q.post_id "
+        "LEFT JOIN chain_user_stake u ON u.post_id = q.post_id AND u.user_address = :addr "
+        "GROUP BY p.support_total, p.challenge_total, p.effective_vs"
+    ), {"pid": post_id, "addr": user_address.lower() if user_address else None}).fetchone()
+    if not row:
+        return {"support": 0.0, "challenge": 0.0, "verity_score": 0.0,
+                "user_support": 0.0, "user_challenge": 0.0}
+    return {
+        "support": row[0] if row[0] is not None else 0.0,
+        "challenge": row[1] if row[1] is not None else 0.0,
+        "verity_score": row[2] if row[2] is not None else 0.0,
+        "user_support": row[3],
+        "user_challenge": row[4],
+    }
+
+
 def get_user_lot_info(db: Session, user_address: str, post_id: int, side: int) -> dict | None:
     """Returns lot info from indexed DB."""
     row = db.execute(sql_text(
@@ -91,13 +91,13 @@ def _set_last_post_id(db, post_id):
 
 
 def _upsert_claim(db, claim_text, post_id):
-    from hashing import content_hash
+    from hashing import content_digest
     from embedding import embed
     from config import EMBEDDINGS_MODEL
 
     normalized = normalize_claim_text(claim_text)
-    h_norm = content_hash(normalized)
-    h_orig = content_hash(claim_text)
+    h_norm = content_digest(normalized)
+    h_orig = content_digest(claim_text)
 
     for h in [h_norm, h_orig]:
         row = db.execute(sql_text(
@@ -26,6 +26,7 @@ from sqlalchemy import text as sql_text
 from sqlalchemy.orm import Session
 
 from db import get_session_factory
+from claim_status_cache import invalidate_not_on_chain_cache
 from config import (
     RPC_URL,
     POST_REGISTRY_ADDRESS,
@@ -62,11 +63,22 @@ def _get_w3():
     return _w3
 
 
+_abi_cache: dict = {}
+
+
 def _load_abi(name):
+    """ABI from the Foundry artifact, parsed once per process. index_post
+    runs after every relayed stake, and the artifacts carry bytecode and
+    AST alongside the ABI, so re-reading them each time is not free.
+    A missing artifact is not cached, so one that appears after a deploy
+    is picked up on the next call."""
+    abi = _abi_cache.get(name)
+    if abi is not None:
+        return abi
     path = Path(f"/core/out/{name}.sol/{name}.json")
     if path.exists():
-        with open(path) as f:
-            return json.load(f)["abi"]
+        abi = _abi_cache[name] = json.loads(path.read_bytes())["abi"]
+        return abi
     return []
 
 
@@ -168,6 +180,8 @@ def index_post(db: Session, post_id: int, user_addresses: list[str] | None = Non
                 _index_user_stake(db, se, addr, post_id)
 
         db.commit()
+        if content_type == 0:
+            invalidate_not_on_chain_cache()
 
     except Exception as e:
         logger.warning("Failed to index post %d: %s", post_id, e)
@@ -448,7 +462,7 @@ def poll_events(db: Session):
                         ), {"pid": pid}).fetchone()
                         if not _has_topic:
                             from articles.topic_detect import detect_topic, ensure_article_for_claim
-                            _topic = detect_topic(_ct[0])
+                            _topic = detect_topic(_ct[0], db)
                             if _topic:
                                 db.execute(sql_text(
                                     "UPDATE claim SET topic = :t WHERE post_id = :pid AND topic IS NULL"
@@ -0,0 +1,44 @@
+# app/claim_status_cache.py
+"""
+Negative cache for /api/claim-status: the frontend polls texts that are
+not on-chain yet, and the answer cannot change until a claim gets a
+post_id.
+
+The cache is per process. Paths that link a claim to a post inside the
+API process clear it: the create/record/check-onchain endpoints in
+main.py, the relay, and chain_indexer.py when it runs in the API. Claims
+the worker's indexer (chain/indexer.py) links can't reach this dict, so
+they show up here only once the 3s TTL expires.
+"""
+import copy
+import hashlib
+import time
+from typing import Any, Dict, Optional
+
+_not_on_chain_cache: Dict[str, tuple] = {}  # text key -> (ts, on_chain)
+_NOT_ON_CHAIN_TTL = 3.0  # seconds
+_NOT_ON_CHAIN_MAX = 10_000
+
+
+def _not_on_chain_key(claim_text: str) -> str:
+    return hashlib.sha1(claim_text.strip().casefold().encode("utf-8")).hexdigest()
+
+
+def get_not_on_chain(claim_text: str) -> Optional[Dict[str, Any]]:
+    """Cached compute_one() result for a text known not to be on-chain,
+    or None. Returns a copy so callers can't mutate the shared entry."""
+    hit = _not_on_chain_cache.get(_not_on_chain_key(claim_text))
+    if hit and time.time() - hit[0] < _NOT_ON_CHAIN_TTL:
+        return copy.deepcopy(hit[1])
+    return None
+
+
+def remember_not_on_chain(claim_text: str, on_chain: Dict[str, Any]) -> None:
+    if len(_not_on_chain_cache) >= _NOT_ON_CHAIN_MAX:
+        _not_on_chain_cache.clear()
+    _not_on_chain_cache[_not_on_chain_key(claim_text)] = (
+        time.time(), copy.deepcopy(on_chain))
+
+
+def invalidate_not_on_chain_cache():
+    _not_on_chain_cache.clear()
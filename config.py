@@ -56,6 +56,11 @@ MM_PRIVATE_KEY = os.getenv("MM_PRIVATE_KEY", "")
 # Treasury wallet (revenue — receives trade fees + relay fees)
 TREASURY_ADDRESS = os.getenv("TREASURY_ADDRESS", MM_ADDRESS)  # fallback to MM if not set
 
+# Relay: seconds between receipt polls (web3 default is 0.1s; C-chain blocks are ~2s)
+RELAY_POLL_LATENCY = float(os.getenv("RELAY_POLL_LATENCY", "1.0"))
+# Relay: worker threads for /api/relay (each holds one through the receipt wait)
+RELAY_WORKERS = int(os.getenv("RELAY_WORKERS", "32"))
+
 # Database
 DB_USER = os.getenv("DB_USER", "verisphere")
 DB_PASS = os.getenv("DB_PASS", "")
@@ -46,7 +46,7 @@ def embed_claim(db: Session, post_id: int, claim_text: str) -> Optional[list]:
     """Embed a claim and store in chain_claim_text. Returns the embedding."""
     # Check if already embedded
     row = db.execute(sql_text(
-        "SELECT embedding::text FROM chain_claim_text WHERE post_id = :pid"
+        "SELECT embedding::real[] FROM chain_claim_text WHERE post_id = :pid"
     ), {"pid": post_id}).fetchone()
 
     if row and row[0]:
@@ -80,7 +80,7 @@ def assign_to_group(db: Session, post_id: int) -> Optional[int]:
     """Assign a claim to its dupe group. Returns group_id."""
     # Get this claim's embedding
     row = db.execute(sql_text(
-        "SELECT embedding::text, claim_text FROM chain_claim_text WHERE post_id = :pid"
+        "SELECT embedding::real[], claim_text FROM chain_claim_text WHERE post_id = :pid"
     ), {"pid": post_id}).fetchone()
 
     if not row or not row[0]:
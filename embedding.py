@@ -1,37 +1,111 @@
-import hashlib, random
+import hashlib, random, threading
+from collections import OrderedDict
 from typing import List
+import httpx
+import numpy as np
 from openai import OpenAI
 from config import OPENAI_API_KEY, EMBEDDINGS_PROVIDER, EMBEDDINGS_MODEL
 
+# One client per process so embeds reuse pooled keep-alive connections
+# instead of paying a TLS handshake each call. Created lazily because the
+# stub provider never needs it.
+_client: OpenAI | None = None
+
+
+def _get_client() -> OpenAI:
+    global _client
+    if _client is None:
+        _client = OpenAI(
+            api_key=OPENAI_API_KEY,
+            http_client=httpx.Client(
+                timeout=60.0,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            ),
+        )
+    return _client
+
+def _unit(vec) -> List[float]:
+    """L2-normalize so every stored embedding has unit length. OpenAI
+    embeddings already do (up to float error); stub vectors do not."""
+    a = np.asarray(vec, dtype=np.float64)
+    n = np.linalg.norm(a)
+    return (a / n).tolist() if n else a.tolist()
+
 def embed_stub(text: str, dims: int = 1536) -> List[float]:
     h = hashlib.sha256(text.encode("utf-8")).digest()
     seed = int.from_bytes(h[:8], "big", signed=False)
     rng = random.Random(seed)
-    return [rng.random() for _ in range(dims)]
+    return _unit([rng.random() for _ in range(dims)])
+
+# The same claim/section text is embedded over and over within a request
+# and across them (relevance checks against every article, section
+# placement, relays), so vectors are kept per text and shared by embed()
+# and embed_batch().
+_EMBED_CACHE_MAX = 4096
+_embed_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_embed_lock = threading.Lock()
+
+
+def _cached_embedding(text: str):
+    with _embed_lock:
+        vec = _embed_cache.get(text)
+        if vec is not None:
+            _embed_cache.move_to_end(text)
+        return vec
+
+
+def _remember_embedding(text: str, vec) -> None:
+    with _embed_lock:
+        _embed_cache[text] = tuple(vec)
+        _embed_cache.move_to_end(text)
+        if len(_embed_cache) > _EMBED_CACHE_MAX:
+            _embed_cache.popitem(last=False)
+
 
 def embed(text: str) -> List[float]:
+    # A fresh list is returned each time because callers are free to
+    # mutate it.
+    vec = _cached_embedding(text)
+    if vec is None:
+        vec = _embed_uncached(text)
+        _remember_embedding(text, vec)
+    return list(vec)
+
+
+def _embed_uncached(text: str) -> List[float]:
     if EMBEDDINGS_PROVIDER == "stub":
         return embed_stub(text)
     if not OPENAI_API_KEY:
         raise RuntimeError("OPENAI_API_KEY not set (required for EMBEDDINGS_PROVIDER=openai)")
-    client = OpenAI(api_key=OPENAI_API_KEY, timeout=20.0)
-    resp = client.embeddings.create(model=EMBEDDINGS_MODEL, input=text, dimensions=1536)
-    return list(resp.data[0].embedding)
+    resp = _get_client().embeddings.create(
+        model=EMBEDDINGS_MODEL, input=text, dimensions=1536, timeout=20.0)
+    return resp.data[0].embedding
 
 
 def embed_batch(texts: List[str], batch_size: int = 100) -> List[List[float]]:
     """Embed many texts in batched OpenAI API calls.
-    Much faster than calling embed() once per text."""
+    Much faster than calling embed() once per text. Texts already in the
+    embed cache (or repeated within texts) are not sent again."""
     if not texts:
         return []
-    if EMBEDDINGS_PROVIDER == "stub":
-        return [embed_stub(t) for t in texts]
-    if not OPENAI_API_KEY:
-        raise RuntimeError("OPENAI_API_KEY not set")
-    client = OpenAI(api_key=OPENAI_API_KEY, timeout=60.0)
-    results = []
-    for i in range(0, len(texts), batch_size):
-        chunk = texts[i:i + batch_size]
-        resp = client.embeddings.create(model=EMBEDDINGS_MODEL, input=chunk, dimensions=1536)
-        results.extend([list(d.embedding) for d in resp.data])
-    return results
+    found = {}
+    for t in texts:
+        if t not in found:
+            found[t] = _cached_embedding(t)
+    missing = [t for t, v in found.items() if v is None]
+    if missing:
+        if EMBEDDINGS_PROVIDER == "stub":
+            fresh = [embed_stub(t) for t in missing]
+        else:
+            if not OPENAI_API_KEY:
+                raise RuntimeError("OPENAI_API_KEY not set")
+            client = _get_client()
+            fresh = []
+            for i in range(0, len(missing), batch_size):
+                chunk = missing[i:i + batch_size]
+                resp = client.embeddings.create(model=EMBEDDINGS_MODEL, input=chunk, dimensions=1536, timeout=60.0)
+                fresh.extend(d.embedding for d in resp.data)
+        for t, v in zip(missing, fresh):
+            _remember_embedding(t, v)
+            found[t] = tuple(v)
+    return [list(found[t]) for t in texts]
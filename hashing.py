@@ -4,5 +4,8 @@ def normalize_text(text: str) -> str:
     text = text.lower()
     text = _PUNCT_RE.sub("", text)
     return " ".join(text.split())
+def content_digest(text: str) -> bytes:
+    """Raw SHA-256 of the normalized text; what claim.content_hash stores."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).digest()
 def content_hash(text: str) -> str:
-    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return content_digest(text).hex()
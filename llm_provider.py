@@ -36,6 +36,11 @@ MODEL = os.environ.get("LLM_MODEL") or _DEFAULT_MODELS.get(PROVIDER, "gpt-4o-min
 
 print(f"✓ LLM provider: {PROVIDER}, model: {MODEL}")
 
+# Clients are created once per process so completions reuse pooled
+# keep-alive connections instead of a fresh TLS handshake per call.
+_openai_client = None
+_anthropic_client = None
+
 
 def complete(
     prompt: str,
@@ -57,9 +62,11 @@ def complete(
 
 
 def _complete_openai(prompt, system, max_tokens, temperature, model):
-    from openai import OpenAI
-
-    client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    global _openai_client
+    if _openai_client is None:
+        from openai import OpenAI
+        _openai_client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    client = _openai_client
 
     messages = []
     if system:
@@ -77,9 +84,11 @@ def _complete_openai(prompt, system, max_tokens, temperature, model):
 
 
 def _complete_anthropic(prompt, system, max_tokens, temperature, model):
-    import anthropic
-
-    client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+    global _anthropic_client
+    if _anthropic_client is None:
+        import anthropic
+        _anthropic_client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+    client = _anthropic_client
 
     kwargs = {
         "model": model,
@@ -2,13 +2,14 @@
 import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi.responses import Response
 from lang_detect import detect_language, lang_instruction, is_rtl
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional
 from datetime import datetime
 from pathlib import Path
 import json
-import json
+import logging
 
 from sqlalchemy.orm import Session
 from sqlalchemy import text
@@ -17,6 +18,7 @@ from sqlalchemy import text as sql_text
 from db import get_db
 from config import USDC_ADDRESS, VSP_ADDRESS, FORWARDER_ADDRESS
 from semantic import compute_one
+from claim_status_cache import get_not_on_chain, remember_not_on_chain, invalidate_not_on_chain_cache
 from chain.claim_registry import create_claim
 from chain.stake import stake_claim
 from relay import router as relay_router
@@ -28,12 +30,20 @@ from articles.article_routes import router as article_router
 from semantic_dedup import router as semantic_dedup_router
 from rate_limit import RateLimitMiddleware, cleanup_rate_limiter
 
+logger = logging.getLogger(__name__)
+
 
 @asynccontextmanager
 async def lifespan(app):
     # Background tasks (indexer, article refresh, dupe groups) run in
     # the separate worker service — see worker.py and docker-compose.yml.
     print("API server started (background tasks run in worker service)")
+    # Deployment addresses are fixed for the life of the process
+    global _contracts_bytes
+    try:
+        _contracts_bytes = _build_contracts_bytes()
+    except Exception as e:
+        print(f"/api/contracts not prebuilt: {e}")
     # Periodic rate limiter cleanup
     import asyncio as _aio
     async def _rl_cleanup():
@@ -159,8 +169,7 @@ def _log_admin_action(db, action: str, params: dict, request):
         ), {"a": action, "p": json.dumps(params), "ip": ip, "kp": key})
         db.commit()
     except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning("Admin audit log failed: %s", e)
+        logger.warning("Admin audit log failed: %s", e)
 
 
 def require_admin(request, db=None, action=None, params=None):
@@ -224,24 +233,32 @@ def update_fee_param(param_key: str, value: str, request: Request = None, db: Se
     invalidate_cache()
     return {"ok": True}
 
+_contracts_bytes: Optional[bytes] = None
+
+
+def _build_contracts_bytes() -> bytes:
+    """Serialize the deployment addresses (plus config overrides) once."""
+    with ADDRESSES_PATH.open() as f:
+        contracts = json.load(f)
+    contracts["USDC"] = USDC_ADDRESS
+    contracts["Forwarder"] = FORWARDER_ADDRESS
+    contracts["VSPToken"] = VSP_ADDRESS
+    contracts = {k: v.lower() if isinstance(v, str) else v for k, v in contracts.items()}
+    return json.dumps(contracts).encode()
+
+
 @app.get("/api/contracts")
 def get_contracts():
-    if not ADDRESSES_PATH.exists():
-        raise HTTPException(500, f"Deployment artifact not found at {ADDRESSES_PATH}")
-    try:
-        with ADDRESSES_PATH.open() as f:
-            contracts = json.load(f)
-        contracts["USDC"] = USDC_ADDRESS
-        contracts["Forwarder"] = FORWARDER_ADDRESS
-        contracts["VSPToken"] = VSP_ADDRESS
-        contracts = {k: v.lower() if isinstance(v, str) else v for k, v in contracts.items()}
-        print(f"Returning {len(contracts)} contracts from /api/contracts")
-        return contracts
-    except Exception as e:
-        import traceback
-        print("ERROR in /api/contracts:", str(e))
-        print(traceback.format_exc())
-        raise HTTPException(500, f"Failed to load contracts: {str(e)}")
+    global _contracts_bytes
+    if _contracts_bytes is None:
+        if not ADDRESSES_PATH.exists():
+            raise HTTPException(500, f"Deployment artifact not found at {ADDRESSES_PATH}")
+        try:
+            _contracts_bytes = _build_contracts_bytes()
+        except Exception as e:
+            logger.exception("ERROR in /api/contracts")
+            raise HTTPException(500, f"Failed to load contracts: {str(e)}")
+    return Response(content=_contracts_bytes, media_type="application/json")
 
 
 
@@ -249,7 +266,11 @@ def get_contracts():
 def claim_status(claim_text: str, user: str = None, db: Session = Depends(get_db)):
     """Return full claim state including on-chain stakes and verity score.
     Uses strict hash matching only — no fuzzy/similarity resolution."""
-    on_chain = compute_one(db, claim_text, top_k=5)
+    on_chain = get_not_on_chain(claim_text)
+    if on_chain is None:
+        on_chain = compute_one(db, claim_text, top_k=5)
+        if on_chain.get("post_id") is None:
+            remember_not_on_chain(claim_text, on_chain)
     post_id = on_chain.get("post_id")
 
     result = {
@@ -264,19 +285,17 @@ def claim_status(claim_text: str, user: str = None, db: Session = Depends(get_db
 
     if post_id is not None:
         try:
-            from chain.chain_db import get_stake_totals as db_stakes, get_verity_score as db_vs, get_user_stake as db_user
-            support, challenge = db_stakes(db, post_id)
-            result["stake_support"] = support
-            result["stake_challenge"] = challenge
-            result["verity_score"] = db_vs(db, post_id)
+            from chain.chain_db import get_claim_state
+            state = get_claim_state(db, post_id, user)
+            result["stake_support"] = state["support"]
+            result["stake_challenge"] = state["challenge"]
+            result["verity_score"] = state["verity_score"]
 
             if user:
-                result["user_support"] = db_user(db, user, post_id, 0)
-                result["user_challenge"] = db_user(db, user, post_id, 1)
-        except Exception as e:
-            import traceback
-            print(f"Failed to read state for post_id={post_id}: {e}")
-            print(traceback.format_exc())
+                result["user_support"] = state["user_support"]
+                result["user_challenge"] = state["user_challenge"]
+        except Exception:
+            logger.exception("Failed to read state for post_id=%s", post_id)
 
     return result
 
@@ -359,9 +378,10 @@ class CreateClaimRequest(BaseModel):
 
 
 @app.post("/api/claims/create")
-def create_claim_endpoint(req: CreateClaimRequest):
+async def create_claim_endpoint(req: CreateClaimRequest):
     try:
-        tx_hash = create_claim(req.text)
+        tx_hash = await asyncio.to_thread(create_claim, req.text)
+        invalidate_not_on_chain_cache()
         return {"tx_hash": tx_hash}
     except Exception as e:
         raise HTTPException(500, f"Failed to create claim: {str(e)}")
@@ -382,6 +402,7 @@ def record_claim_endpoint(req: RecordClaimRequest, db: Session = Depends(get_db)
             "WHERE LOWER(TRIM(claim_text)) = LOWER(TRIM(:t)) AND post_id IS NULL"
         ), {"pid": req.post_id, "t": req.text})
         db.commit()
+        invalidate_not_on_chain_cache()
         return {"ok": True, "post_id": req.post_id}
     except Exception as e:
         print(f"record_claim failed: {e}")
@@ -407,6 +428,7 @@ def check_claim_onchain(text: str, db: Session = Depends(get_db)):
                 "WHERE LOWER(TRIM(text)) = LOWER(TRIM(:t)) AND post_id IS NULL"
             ), {"pid": post_id, "t": text})
             db.commit()
+            invalidate_not_on_chain_cache()
         except Exception as e:
             print(f"check-onchain DB sync failed: {e}")
         return {"exists": True, "post_id": post_id}
@@ -497,9 +519,9 @@ def reindex_post(post_id: int, user: str = None):
         return {"ok": False, "error": str(e)}
 
 @app.post("/api/claims/stake")
-def stake_endpoint(req: StakeRequest):
+async def stake_endpoint(req: StakeRequest):
     try:
-        tx_hash = stake_claim(req.claim_id, req.side, req.amount)
+        tx_hash = await asyncio.to_thread(stake_claim, req.claim_id, req.side, req.amount)
         return {"tx_hash": tx_hash}
     except Exception as e:
         raise HTTPException(500, f"Failed to stake: {str(e)}")
@@ -513,10 +535,10 @@ class WithdrawRequest(BaseModel):
 
 
 @app.post("/api/claims/unstake")
-def unstake_endpoint(req: WithdrawRequest):
+async def unstake_endpoint(req: WithdrawRequest):
     try:
         from chain.stake import withdraw_stake
-        tx_hash = withdraw_stake(req.claim_id, req.side, req.amount, req.lifo)
+        tx_hash = await asyncio.to_thread(withdraw_stake, req.claim_id, req.side, req.amount, req.lifo)
         return {"tx_hash": tx_hash}
     except Exception as e:
         raise HTTPException(500, f"Failed to unstake: {str(e)}")
@@ -529,10 +551,11 @@ class CreateLinkRequest(BaseModel):
 
 
 @app.post("/api/links/create")
-def create_link_endpoint(req: CreateLinkRequest):
+async def create_link_endpoint(req: CreateLinkRequest):
     try:
         from chain.claim_registry import create_link
-        tx_hash = create_link(req.independent_post_id, req.dependent_post_id, req.is_challenge)
+        tx_hash = await asyncio.to_thread(
+            create_link, req.independent_post_id, req.dependent_post_id, req.is_challenge)
         return {"tx_hash": tx_hash}
     except Exception as e:
         raise HTTPException(500, f"Failed to create link: {str(e)}")
\ No newline at end of file
@@ -2,14 +2,20 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
 
-from semantic import compute_one
+from semantic import compute_many
 from chain.claim_state import find_claim_by_text, fetch_claim_state
 
 logger = logging.getLogger(__name__)
 
+# _enrich is RPC-bound (ProtocolViews read, plus a registry scan for claims
+# the DB has no post_id for) and never touches the DB session, so distinct
+# claims are enriched concurrently.
+_enrich_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="merge-enrich")
+
 
 def merge_article_with_chain(
     result: Dict[str, Any],
@@ -36,39 +42,51 @@ def merge_article_with_chain(
     # Explicit claims → normalize into an article
     # --------------------------------------------------
     if kind == "claims":
-        merged_claims = [
-            _merge_claim(c, db) for c in result.get("claims", [])
+        raw_sections = [{"id": "claims", "text": "", "claims": result.get("claims", [])}]
+        title = "User Claims"
+    elif kind == "article":
+        raw_sections = result.get("sections", [])
+        title = result.get("title", "Article")
+    else:
+        raw_sections = None
+
+    if raw_sections is not None:
+        # Collect every claim across all sections once, so the semantic
+        # lookup is one batched embed + one grouped pgvector query.
+        raw_claims = [c for sec in raw_sections for c in (sec.get("claims") or [])]
+        texts = [(c.get("text") or "").strip() for c in raw_claims]
+
+        # The same claim often repeats across sections; enrich each
+        # distinct text once and reuse the result for its duplicates.
+        keys = [t.casefold() for t in texts]
+        first_text: Dict[str, str] = {}
+        for k, t in zip(keys, texts):
+            first_text.setdefault(k, t)
+        semantic_results = _semantic_lookup(db, list(first_text.values()))
+        seen: Dict[str, Dict[str, Any]] = dict(zip(
+            first_text.keys(),
+            _enrich_pool.map(_enrich, first_text.values(), semantic_results),
+        ))
+
+        merged = [
+            _merge_claim(c, t, dict(seen[k]))
+            for c, t, k in zip(raw_claims, texts, keys)
         ]
-        return {
-            "kind": "article",
-            "title": "User Claims",
-            "sections": [
-                {
-                    "id": "claims",
-                    "text": "",
-                    "claims": merged_claims,
-                }
-            ],
-        }
 
-    # --------------------------------------------------
-    # Article
-    # --------------------------------------------------
-    if kind == "article":
+        # Assign merged claims back to their sections by index
         sections = []
-        for sec in result.get("sections", []):
-            merged_claims = [
-                _merge_claim(c, db)
-                for c in (sec.get("claims") or [])
-            ]
+        pos = 0
+        for sec in raw_sections:
+            n = len(sec.get("claims") or [])
             sections.append({
                 "id":     sec.get("id", "section"),
                 "text":   sec.get("text", ""),
-                "claims": merged_claims,
+                "claims": merged[pos:pos + n],
             })
+            pos += n
         return {
             "kind":     "article",
-            "title":    result.get("title", "Article"),
+            "title":    title,
             "sections": sections,
         }
 
@@ -81,42 +99,47 @@ def merge_article_with_chain(
     }
 
 
-def _merge_claim(
-    claim: Dict[str, Any],
-    db: Session,
+def _semantic_lookup(db: Session, texts: List[str]) -> List[Dict[str, Any]]:
+    """Batched DB semantic metadata for every claim text. Never raises."""
+    if not texts:
+        return []
+    try:
+        return compute_many(db, texts, top_k=5)
+    except Exception as e:
+        logger.warning("compute_many failed for %d claims: %s", len(texts), e)
+        return [{} for _ in texts]
+
+
+def _enrich(
+    text: str,
+    semantic_result: Optional[Dict[str, Any]],
 ) -> Dict[str, Any]:
     """
-    Merge a single claim with DB semantic metadata and blockchain state.
-
-    Returns:
-      on_chain – DB metadata (hash, similar claims) PLUS blockchain state if found
-      stake_support / stake_challenge – top-level convenience fields
+    DB semantic metadata (hash, similar claims) for a claim text, plus
+    blockchain state if the claim is on-chain. Never raises.
     """
 
-    text = (claim.get("text") or "").strip()
+    preview = text[:60]
 
     # --------------------------------------------------
-    # Step 1: Semantic dedup — DB lookup
+    # Step 1: Semantic dedup — precomputed by _semantic_lookup()
     # --------------------------------------------------
-    db_meta = {}
-
-    try:
-        semantic_result = compute_one(db, text, top_k=5)
-        if semantic_result:
-            db_meta = semantic_result  # Contains: hash, claim_id, classification, similar
-    except Exception as e:
-        logger.warning(f"compute_one failed for '{text[:60]}': {e}")
+    db_meta = dict(semantic_result) if semantic_result else {}
 
     # --------------------------------------------------
     # Step 2: Blockchain lookup — augment db_meta with chain state
     # --------------------------------------------------
     try:
-        post_id = find_claim_by_text(text)
-        
+        # The indexer and relay record post_id on the claim row, so only
+        # fall back to the registry scan when the DB doesn't know it yet.
+        post_id = db_meta.get("post_id")
+        if post_id is None:
+            post_id = find_claim_by_text(text)
+
         if post_id is not None:
-            logger.info(f"Found on-chain post_id={post_id} for '{text[:40]}'")
+            logger.info("Found on-chain post_id=%s for '%s'", post_id, preview)
             state = fetch_claim_state(post_id)
-            
+
             # Merge blockchain state into db_meta
             db_meta.update({
                 "eVS":   state["eVS"],
@@ -124,30 +147,43 @@ def _merge_claim(
                 "links": state["links"],
             })
         else:
-            logger.debug(f"Claim not found on-chain: '{text[:40]}'")
-    
+            logger.debug("Claim not found on-chain: '%s'", preview)
+
     except Exception as e:
-        logger.warning(f"Blockchain lookup failed for '{text[:60]}': {e}")
+        logger.warning("Blockchain lookup failed for '%s': %s", preview, e)
+
+    return db_meta
+
+
+def _merge_claim(
+    claim: Dict[str, Any],
+    text: str,
+    db_meta: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Build a single frontend claim from the LLM claim and its enrichment.
+
+    Returns:
+      on_chain – DB metadata (hash, similar claims) PLUS blockchain state if found
+      stake_support / stake_challenge – top-level convenience fields
+    """
 
-    # --------------------------------------------------
-    # Step 3: Return merged claim
-    # --------------------------------------------------
     # If db_meta is empty, on_chain will be None
     # If db_meta has data but no blockchain state, on_chain will have DB fields only
     # If blockchain state found, on_chain will have everything
-    
+
     on_chain_data = db_meta if db_meta else None
-    
+
     return {
         "text":           text,
         "confidence":     claim.get("confidence", 0.7),
         "actions":        claim.get("actions", []),
         "author":         claim.get("author", "AI Search"),
-        
+
         "on_chain":       on_chain_data,
-        
+
         # Convenience top-level fields
         "stake_support":  db_meta.get("stake", {}).get("support", 0),
         "stake_challenge": db_meta.get("stake", {}).get("challenge", 0),
         "verity_score":   db_meta.get("eVS", 0),
-    }
\ No newline at end of file
+    }
@@ -39,6 +39,10 @@ DEFAULT_HALF_SPREAD = 0.0025   # 0.25% half-spread → 0.5% round trip
 # Core price curve
 # ────────────────────────────────────────────────────────────
 
+# 1 / ln(10)^2 — converts ln(x)^2 to log10(x)^2
+_INV_LN10_SQ = 1.0 / math.log(10) ** 2
+
+
 def _base_price(n: float, gold_usd: float, unit_au: float) -> float:
     """
     Base (mid) price at a given net_vsp position.
@@ -52,7 +56,8 @@ def _base_price(n: float, gold_usd: float, unit_au: float) -> float:
     Returns price in USD per 1 VSP.
     """
     if n >= 0:
-        return math.log10(n + 10) ** 2 * unit_au * gold_usd
+        lg = math.log(n + 10)
+        return lg * lg * _INV_LN10_SQ * unit_au * gold_usd
     # Negative territory handled by caller via _reserve_price
     # This shouldn't be reached, but defensive:
     return unit_au * gold_usd * 0.01
@@ -93,35 +98,77 @@ def _reserve_price(
 # Volume-integrated fills
 # ────────────────────────────────────────────────────────────
 
+def _log10_sq_antiderivative(n: float) -> float:
+    """
+    Antiderivative of log10(n + 10)^2 with respect to n.
+
+    With u = ln(n + 10):  d/dn [(n + 10)(u^2 - 2u + 2)] = u^2,
+    so F(n) = (n + 10)(u^2 - 2u + 2) / ln(10)^2.
+    """
+    x = n + 10
+    u = math.log(x)
+    return x * (u * u - 2 * u + 2) * _INV_LN10_SQ
+
+
+def _base_integral(
+    n_lo: float,
+    n_hi: float,
+    gold_usd: float,
+    unit_au: float,
+) -> float:
+    """
+    Exact integral of _base_price over [n_lo, n_hi].
+
+    The n >= 0 segment uses the closed-form antiderivative; any n < 0
+    segment uses _base_price's constant defensive value.
+    """
+    total = 0.0
+    if n_hi > 0:
+        lo = max(n_lo, 0.0)
+        total += (_log10_sq_antiderivative(n_hi) - _log10_sq_antiderivative(lo)) * unit_au * gold_usd
+    if n_lo < 0:
+        total += (min(n_hi, 0.0) - n_lo) * unit_au * gold_usd * 0.01
+    return total
+
+
+def _reserve_integral(
+    n_lo: float,
+    n_hi: float,
+    usdc_reserves: float,
+    vsp_circulating: float,
+) -> float:
+    """
+    Exact integral of _reserve_price over [n_lo, n_hi], with n_hi <= 0.
+
+    In terms of absorbed = -n the price is floor * (1 - absorbed / S),
+    clipped at zero once absorbed >= S.
+    """
+    if vsp_circulating <= 0 or usdc_reserves <= 0:
+        return 0.0
+    floor = usdc_reserves / vsp_circulating
+    a0 = min(-n_hi, vsp_circulating)
+    a1 = min(-n_lo, vsp_circulating)
+    return floor * ((a1 - a0) - (a1 * a1 - a0 * a0) / (2 * vsp_circulating))
+
+
 def _integrate_buy_cost(
     n_start: float,
     qty: float,
     gold_usd: float,
     unit_au: float,
     half_spread: float,
-    steps: int = 100,
 ) -> float:
     """
     Integrate buy price along the curve from n_start to n_start + qty.
     Buy price = base_price * (1 + half_spread) at each point.
 
     Returns total USDC cost for the entire order.
-    Uses trapezoidal integration with `steps` intervals.
+    Evaluated in closed form (see _log10_sq_antiderivative).
     """
     if qty <= 0:
         return 0.0
 
-    step_size = qty / steps
-    total = 0.0
-
-    for i in range(steps):
-        n_lo = n_start + i * step_size
-        n_hi = n_lo + step_size
-        p_lo = _base_price(n_lo, gold_usd, unit_au) * (1 + half_spread)
-        p_hi = _base_price(n_hi, gold_usd, unit_au) * (1 + half_spread)
-        total += (p_lo + p_hi) / 2 * step_size
-
-    return total
+    return _base_integral(n_start, n_start + qty, gold_usd, unit_au) * (1 + half_spread)
 
 
 def _integrate_sell_proceeds(
@@ -132,7 +179,6 @@ def _integrate_sell_proceeds(
     half_spread: float,
     usdc_reserves: float,
     vsp_circulating: float,
-    steps: int = 100,
 ) -> float:
     """
     Integrate sell price along the curve from n_start down to n_start - qty.
@@ -146,24 +192,16 @@ def _integrate_sell_proceeds(
     if qty <= 0:
         return 0.0
 
-    step_size = qty / steps
+    n_hi = n_start
+    n_lo = n_start - qty
     total = 0.0
 
-    for i in range(steps):
-        n_hi = n_start - i * step_size
-        n_lo = n_hi - step_size
-
-        p_hi = _sell_price_at(
-            n_hi, gold_usd, unit_au, half_spread,
-            usdc_reserves, vsp_circulating,
-        )
-        p_lo = _sell_price_at(
-            n_lo, gold_usd, unit_au, half_spread,
-            usdc_reserves, vsp_circulating,
-        )
-        total += (p_hi + p_lo) / 2 * step_size
+    if n_hi > 0:
+        total += _base_integral(max(n_lo, 0.0), n_hi, gold_usd, unit_au)
+    if n_lo < 0:
+        total += _reserve_integral(n_lo, min(n_hi, 0.0), usdc_reserves, vsp_circulating)
 
-    return max(0.0, total)
+    return max(0.0, total * (1 - half_spread))
 
 
 def _sell_price_at(
@@ -187,7 +225,7 @@ def _sell_price_at(
 # Public interface
 # ────────────────────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MMQuote:
     """Quote for a specific order or spot price."""
     mid_price_usd: float       # Mid price at current net_vsp
@@ -200,7 +238,7 @@ class MMQuote:
     sell_avax: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MMFillResult:
     """Result of a volume-integrated fill."""
     total_usd: float           # Total cost (buy) or proceeds (sell)
@@ -215,12 +253,14 @@ def get_spot_quote(
     vsp_circulating: float,
     unit_au: float = DEFAULT_UNIT_AU,
     half_spread: float = DEFAULT_HALF_SPREAD,
+    gold_usd: Optional[float] = None,
 ) -> MMQuote:
     """
     Get current spot prices (for display / quote endpoint).
     These are indicative — actual fills use volume integration.
+    Pass gold_usd to reuse an oracle price already fetched for this request.
     """
-    gold = get_gold_price_usd_per_oz()
+    gold = gold_usd if gold_usd is not None else get_gold_price_usd_per_oz()
     avax = get_avax_price_usd()
 
     n = float(net_vsp)
@@ -261,12 +301,14 @@ def compute_buy_fill(
     vsp_circulating: float,
     unit_au: float = DEFAULT_UNIT_AU,
     half_spread: float = DEFAULT_HALF_SPREAD,
+    gold_usd: Optional[float] = None,
 ) -> MMFillResult:
     """
     Compute the total USDC cost to buy `qty_vsp` VSP.
     Integrates along the buy curve from net_vsp to net_vsp + qty.
+    Pass gold_usd to reuse an oracle price already fetched for this request.
     """
-    gold = get_gold_price_usd_per_oz()
+    gold = gold_usd if gold_usd is not None else get_gold_price_usd_per_oz()
     n = float(net_vsp)
 
     total_cost = _integrate_buy_cost(n, qty_vsp, gold, unit_au, half_spread)
@@ -287,6 +329,7 @@ def compute_sell_fill(
     vsp_circulating: float,
     unit_au: float = DEFAULT_UNIT_AU,
     half_spread: float = DEFAULT_HALF_SPREAD,
+    gold_usd: Optional[float] = None,
 ) -> MMFillResult:
     """
     Compute the total USDC proceeds from selling `qty_vsp` VSP.
@@ -294,8 +337,9 @@ def compute_sell_fill(
 
     For sells that cross n=0, the integration naturally transitions
     from the supply curve to the reserve distribution curve.
+    Pass gold_usd to reuse an oracle price already fetched for this request.
     """
-    gold = get_gold_price_usd_per_oz()
+    gold = gold_usd if gold_usd is not None else get_gold_price_usd_per_oz()
     n = float(net_vsp)
 
     total_proceeds = _integrate_sell_proceeds(
@@ -6,7 +6,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
 from datetime import datetime, timezone
+from decimal import Decimal
 
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
@@ -17,6 +20,7 @@ from db import get_db
 from fee_calculator import compute_fee as calc_fee
 from mm.erc20 import allowance, transfer, transfer_from
 from config import USDC_ADDRESS, VSP_ADDRESS, MM_ADDRESS, TREASURY_ADDRESS
+from mm.oracle import get_gold_price_usd_per_oz
 from mm.mm_pricing import (
     get_spot_quote,
     compute_buy_fill,
@@ -37,42 +41,81 @@ router = APIRouter(prefix="/api/mm", tags=["market-maker"])
 # Helpers
 # ────────────────────────────────────────────────────────────
 
+_VSP_WEI = 10**18       # VSP has 18 decimals
+_USDC_SCALE = 1_000_000  # USDC has 6 decimals
+
+
+_ts_cache = {"sec": 0, "iso": ""}
+
+
+def _now_iso() -> str:
+    """UTC ISO timestamp at 1-second resolution, formatted once per second.
+
+    Quote/floor/preview timestamps are only meaningful to the second, so
+    repeated polls within the same second share one string.
+    """
+    sec = int(time.time())
+    if sec != _ts_cache["sec"]:
+        _ts_cache["iso"] = datetime.fromtimestamp(sec, timezone.utc).isoformat()
+        _ts_cache["sec"] = sec
+    return _ts_cache["iso"]
+
+
+def _usdc_to_micro(amount_usd: float) -> int:
+    """Convert a USD float to integer micro-USDC, rounding (half-even)
+    rather than truncating, so 8.2 does not become 8199999."""
+    return round(amount_usd * _USDC_SCALE)
+
+
+def _vsp_to_wei(qty_vsp: float) -> int:
+    """Convert a VSP amount to wei without going through float * 1e18.
+
+    float(qty) * 10**18 picks up binary rounding error (1.1 VSP becomes
+    1100000000000000128 wei); scaling the shortest decimal repr is exact.
+    """
+    return int(Decimal(repr(qty_vsp)) * _VSP_WEI)
+
+
+_SQL_LOAD_MM_STATE = (
+    "SELECT net_vsp, unit_au, half_spread, usdc_reserves, vsp_circulating "
+    "FROM mm_state WHERE id = TRUE"
+)
+_LOAD_MM_STATE = text(_SQL_LOAD_MM_STATE)
+_LOAD_MM_STATE_FOR_UPDATE = text(_SQL_LOAD_MM_STATE + " FOR UPDATE")
+
+# Apply a fill to mm_state (incl. fee tracking) and append it to mm_trade
+_RECORD_TRADE = text(
+    "WITH upd AS ("
+    "  UPDATE mm_state "
+    "  SET net_vsp = :na, usdc_reserves = :ra, vsp_circulating = :ca, "
+    "      fees_collected_usdc = COALESCE(fees_collected_usdc, 0) + :fee, "
+    "      updated_at = now() "
+    "  WHERE id = TRUE "
+    "  RETURNING id"
+    ") "
+    "INSERT INTO mm_trade "
+    "(side, user_address, qty_vsp, total_usdc, avg_price_usd, "
+    " net_vsp_before, net_vsp_after, usdc_reserves_after, vsp_circulating_after) "
+    "SELECT :side, :user, :qty, :total, :avg, :nb, :na, :ra, :ca FROM upd"
+)
+
+
 def _load_mm_state(db: Session, *, for_update: bool = False):
-    suffix = " FOR UPDATE" if for_update else ""
-    row = db.execute(
-        text(
-            "SELECT net_vsp, unit_au, half_spread, usdc_reserves, vsp_circulating "
-            f"FROM mm_state WHERE id = TRUE{suffix}"
-        )
-    ).fetchone()
+    stmt = _LOAD_MM_STATE_FOR_UPDATE if for_update else _LOAD_MM_STATE
+    row = db.execute(stmt).fetchone()
     if not row:
         raise HTTPException(503, "MM state not initialized")
     return row
 
 
-def _update_mm_state(db, net_vsp, usdc_reserves, vsp_circulating):
-    db.execute(
-        text(
-            "UPDATE mm_state "
-            "SET net_vsp = :n, usdc_reserves = :r, vsp_circulating = :c, "
-            "    updated_at = now() "
-            "WHERE id = TRUE"
-        ),
-        {"n": net_vsp, "r": usdc_reserves, "c": vsp_circulating},
-    )
-
-
-def _log_trade(db, *, side, user_address, qty_vsp, total_usdc, avg_price_usd,
-               net_vsp_before, net_vsp_after, usdc_reserves_after, vsp_circulating_after):
+def _record_trade(db, *, side, user_address, qty_vsp, total_usdc, avg_price_usd, fee_usdc,
+                  net_vsp_before, net_vsp_after, usdc_reserves_after, vsp_circulating_after):
+    """Apply a fill to mm_state (incl. fee tracking) and append it to mm_trade
+    in one statement. Caller holds the mm_state row lock."""
     db.execute(
-        text(
-            "INSERT INTO mm_trade "
-            "(side, user_address, qty_vsp, total_usdc, avg_price_usd, "
-            " net_vsp_before, net_vsp_after, usdc_reserves_after, vsp_circulating_after) "
-            "VALUES (:side, :user, :qty, :total, :avg, :nb, :na, :ra, :ca)"
-        ),
+        _RECORD_TRADE,
         {"side": side, "user": user_address, "qty": qty_vsp, "total": total_usdc,
-         "avg": avg_price_usd, "nb": net_vsp_before, "na": net_vsp_after,
+         "avg": avg_price_usd, "fee": fee_usdc, "nb": net_vsp_before, "na": net_vsp_after,
          "ra": usdc_reserves_after, "ca": vsp_circulating_after},
     )
 
@@ -166,7 +209,7 @@ def mm_floor(db: Session = Depends(get_db)):
             "floor_price_usd": round(floor, 8),
             "usdc_reserves": round(usdc_reserves, 2),
             "vsp_circulating": round(vsp_circulating, 2),
-            "ts": datetime.now(timezone.utc).isoformat(),
+            "ts": _now_iso(),
         }
     except HTTPException:
         raise
@@ -185,8 +228,7 @@ _QUOTE_CACHE_TTL = 5  # seconds
 
 @router.get("/quote")
 def mm_quote(db: Session = Depends(get_db)):
-    import time as _t
-    if _quote_cache['data'] and _t.time() - _quote_cache['ts'] < _QUOTE_CACHE_TTL:
+    if _quote_cache['data'] and time.time() - _quote_cache['ts'] < _QUOTE_CACHE_TTL:
         return _quote_cache['data']
     try:
         row = _load_mm_state(db)
@@ -200,10 +242,10 @@ def mm_quote(db: Session = Depends(get_db)):
             "buy_price_usd": round(q.buy_price_usd, 8),
             "sell_price_usd": round(q.sell_price_usd, 8),
             "floor_price_usd": round(q.floor_price_usd, 8),
-            "ts": datetime.now(timezone.utc).isoformat(),
+            "ts": _now_iso(),
         }
         _quote_cache['data'] = _result
-        _quote_cache['ts'] = _t.time()
+        _quote_cache['ts'] = time.time()
         return _result
     except HTTPException:
         raise
@@ -233,7 +275,7 @@ def mm_preview(req: FillPreviewRequest, db: Session = Depends(get_db)):
             "side": req.side, "qty_vsp": req.qty_vsp,
             "total_usdc": round(total_usdc_with_fee, 6),
             "avg_price_usd": round(fill.avg_price_usd, 8),
-            "ts": datetime.now(timezone.utc).isoformat(),
+            "ts": _now_iso(),
         }
     except HTTPException:
         raise
@@ -289,9 +331,10 @@ def preview_buy(qty_vsp: float = None, usdc_amount: float = None, db: Session =
     Specify qty_vsp (exact VSP output) or usdc_amount (exact USDC budget)."""
     row = _load_mm_state(db)
     net_vsp, unit_au, half_spread, usdc_reserves, vsp_circulating = row
+    gold = get_gold_price_usd_per_oz()
 
     if qty_vsp and qty_vsp > 0:
-        fill = compute_buy_fill(net_vsp, qty_vsp, usdc_reserves, vsp_circulating, unit_au, half_spread)
+        fill = compute_buy_fill(net_vsp, qty_vsp, usdc_reserves, vsp_circulating, unit_au, half_spread, gold_usd=gold)
         fee = calc_fee(db, "buy", qty_vsp)
         fee_usdc = fee["fee_vsp"] * fill.avg_price_usd
         return {
@@ -306,11 +349,11 @@ def preview_buy(qty_vsp: float = None, usdc_amount: float = None, db: Session =
         }
     elif usdc_amount and usdc_amount > 0:
         # Iterate to find qty that fits budget including fee
-        fill1 = compute_buy_fill(net_vsp, 1.0, usdc_reserves, vsp_circulating, unit_au, half_spread)
+        fill1 = compute_buy_fill(net_vsp, 1.0, usdc_reserves, vsp_circulating, unit_au, half_spread, gold_usd=gold)
         price = fill1.avg_price_usd
         qty_est = usdc_amount / price
         for _ in range(10):
-            fill = compute_buy_fill(net_vsp, qty_est, usdc_reserves, vsp_circulating, unit_au, half_spread)
+            fill = compute_buy_fill(net_vsp, qty_est, usdc_reserves, vsp_circulating, unit_au, half_spread, gold_usd=gold)
             fee = calc_fee(db, "buy", qty_est)
             fee_usdc = fee["fee_vsp"] * fill.avg_price_usd
             total = fill.total_usd + fee_usdc
@@ -349,26 +392,47 @@ def preview_sell(qty_vsp: float, db: Session = Depends(get_db)):
         "breakdown": fee["breakdown"],
     }
 
+
+# mm_buy/mm_sell keep the mm_state row locked (FOR UPDATE) from pricing
+# until the trade is recorded, including the on-chain transfers in between,
+# so concurrent trades serialize against a consistent state. The whole
+# locked section therefore runs in a worker thread; only the handler
+# itself is async.
+
 @router.post("/buy")
-def mm_buy(req: MMTradeRequest, db: Session = Depends(get_db)):
+async def mm_buy(req: MMTradeRequest, db: Session = Depends(get_db)):
+    """Buy VSP with USDC (optionally via an EIP-2612 permit)."""
+    return await asyncio.to_thread(_execute_buy, req, db)
+
+
+@router.post("/sell")
+async def mm_sell(req: MMTradeRequest, db: Session = Depends(get_db)):
+    """Sell VSP for USDC (optionally via an EIP-2612 permit)."""
+    return await asyncio.to_thread(_execute_sell, req, db)
+
+
+def _execute_buy(req: MMTradeRequest, db: Session):
     """
     Buy VSP with USDC.
     If permit is provided, MM executes USDC.permit() first (gasless for user).
     Otherwise, falls back to checking existing allowance.
     """
     try:
+        # Oracle may hit the network; fetch before taking the mm_state row lock
+        gold = get_gold_price_usd_per_oz()
         with db.begin():
             row = _load_mm_state(db, for_update=True)
             net_vsp, unit_au, half_spread, usdc_reserves, vsp_circulating = row
 
             fill = compute_buy_fill(
                 net_vsp, req.qty_vsp, usdc_reserves, vsp_circulating, unit_au, half_spread,
+                gold_usd=gold,
             )
 
             if fill.total_usd > req.max_total_usdc:
                 raise HTTPException(400, f"Fill cost {fill.total_usd:.6f} USDC exceeds max {req.max_total_usdc:.6f}")
 
-            usdc_micro = int(fill.total_usd * 1_000_000)
+            usdc_micro = _usdc_to_micro(fill.total_usd)
 
             # Execute permit if provided
             if req.permit:
@@ -390,8 +454,8 @@ def mm_buy(req: MMTradeRequest, db: Session = Depends(get_db)):
             fee_usdc = fee_info["fee_vsp"] * fill.avg_price_usd
             total_usdc_with_fee = fill.total_usd + fee_usdc
             # Split: reserves to MM, fee to treasury
-            reserves_micro = int(fill.total_usd * 1_000_000)
-            fee_micro = int(fee_usdc * 1_000_000)
+            reserves_micro = usdc_micro
+            fee_micro = _usdc_to_micro(fee_usdc)
 
             # Execute on-chain transfers
             transfer_from(USDC_ADDRESS, req.user_address, MM_ADDRESS, reserves_micro)
@@ -399,35 +463,19 @@ def mm_buy(req: MMTradeRequest, db: Session = Depends(get_db)):
                 transfer_from(USDC_ADDRESS, req.user_address, TREASURY_ADDRESS, fee_micro)
             elif fee_micro > 0:
                 transfer_from(USDC_ADDRESS, req.user_address, MM_ADDRESS, fee_micro)
-            transfer(VSP_ADDRESS, req.user_address, int(req.qty_vsp * 10**18))
+            transfer(VSP_ADDRESS, req.user_address, _vsp_to_wei(req.qty_vsp))
 
             new_net = fill.new_net_vsp
-            new_reserves = usdc_reserves + fill.total_usd
+            # Book exactly what moved on-chain
+            new_reserves = usdc_reserves + reserves_micro / _USDC_SCALE
             new_circ = vsp_circulating + req.qty_vsp
 
-            _update_mm_state(db, new_net, new_reserves, new_circ)
-            _log_trade(db, side="buy", user_address=req.user_address,
-                       qty_vsp=req.qty_vsp, total_usdc=fill.total_usd,
-                       avg_price_usd=fill.avg_price_usd, net_vsp_before=net_vsp,
-                       net_vsp_after=new_net, usdc_reserves_after=new_reserves,
-                       vsp_circulating_after=new_circ)
-
-            # Track trade fee separately from reserves
-            try:
-                db.execute(sql_text(
-                    "UPDATE mm_state SET fees_collected_usdc = "
-                    "COALESCE(fees_collected_usdc, 0) + :fee"
-                ), {"fee": fee_usdc})
-            except Exception:
-                pass
-
-            try:
-                db.execute(sql_text(
-                    "UPDATE mm_state SET fees_collected_usdc = "
-                    "COALESCE(fees_collected_usdc, 0) + :fee"
-                ), {"fee": fee_usdc})
-            except Exception:
-                pass
+            # Trade fee is tracked separately from reserves
+            _record_trade(db, side="buy", user_address=req.user_address,
+                          qty_vsp=req.qty_vsp, total_usdc=fill.total_usd,
+                          avg_price_usd=fill.avg_price_usd, fee_usdc=fee_usdc,
+                          net_vsp_before=net_vsp, net_vsp_after=new_net,
+                          usdc_reserves_after=new_reserves, vsp_circulating_after=new_circ)
 
         return {"ok": True, "qty_vsp": req.qty_vsp,
                 "fee_vsp": fee_info["fee_vsp"],
@@ -438,26 +486,26 @@ def mm_buy(req: MMTradeRequest, db: Session = Depends(get_db)):
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        print(f"MM buy error: {e}")
-        print(traceback.format_exc())
+        logger.exception("MM buy failed")
         raise HTTPException(500, f"Failed to buy VSP: {e}")
 
 
-@router.post("/sell")
-def mm_sell(req: MMTradeRequest, db: Session = Depends(get_db)):
+def _execute_sell(req: MMTradeRequest, db: Session):
     """
     Sell VSP for USDC.
     If permit is provided, MM executes VSP.permit() first (gasless for user).
     Otherwise, falls back to checking existing allowance.
     """
     try:
+        # Oracle may hit the network; fetch before taking the mm_state row lock
+        gold = get_gold_price_usd_per_oz()
         with db.begin():
             row = _load_mm_state(db, for_update=True)
             net_vsp, unit_au, half_spread, usdc_reserves, vsp_circulating = row
 
             fill = compute_sell_fill(
                 net_vsp, req.qty_vsp, usdc_reserves, vsp_circulating, unit_au, half_spread,
+                gold_usd=gold,
             )
 
             if fill.total_usd < req.max_total_usdc:
@@ -466,7 +514,7 @@ def mm_sell(req: MMTradeRequest, db: Session = Depends(get_db)):
             if fill.total_usd > usdc_reserves:
                 raise HTTPException(400, "Insufficient USDC reserves to fill this sell order")
 
-            vsp_wei = int(req.qty_vsp * 10**18)
+            vsp_wei = _vsp_to_wei(req.qty_vsp)
 
             # Execute permit if provided
             if req.permit:
@@ -490,40 +538,24 @@ def mm_sell(req: MMTradeRequest, db: Session = Depends(get_db)):
 
             # Execute on-chain transfers
             transfer_from(VSP_ADDRESS, req.user_address, MM_ADDRESS, vsp_wei)
-            usdc_micro = int(net_usdc * 1_000_000)
+            usdc_micro = _usdc_to_micro(net_usdc)
             transfer(USDC_ADDRESS, req.user_address, usdc_micro)
             # Send fee to treasury
-            fee_micro = int(fee_usdc * 1_000_000)
+            fee_micro = _usdc_to_micro(fee_usdc)
             if fee_micro > 0 and TREASURY_ADDRESS.lower() != MM_ADDRESS.lower():
                 transfer(USDC_ADDRESS, TREASURY_ADDRESS, fee_micro)
 
             new_net = fill.new_net_vsp
-            new_reserves = usdc_reserves - fill.total_usd
+            # Book exactly what moved on-chain (payout + fee)
+            new_reserves = usdc_reserves - (usdc_micro + fee_micro) / _USDC_SCALE
             new_circ = vsp_circulating - req.qty_vsp
 
-            _update_mm_state(db, new_net, new_reserves, new_circ)
-            # Track trade fee separately
-            try:
-                db.execute(sql_text(
-                    "UPDATE mm_state SET fees_collected_usdc = "
-                    "COALESCE(fees_collected_usdc, 0) + :fee"
-                ), {"fee": fee_usdc})
-            except Exception:
-                pass
-
-            try:
-                db.execute(sql_text(
-                    "UPDATE mm_state SET fees_collected_usdc = "
-                    "COALESCE(fees_collected_usdc, 0) + :fee"
-                ), {"fee": fee_usdc})
-            except Exception:
-                pass
-
-            _log_trade(db, side="sell", user_address=req.user_address,
-                       qty_vsp=req.qty_vsp, total_usdc=fill.total_usd,
-                       avg_price_usd=fill.avg_price_usd, net_vsp_before=net_vsp,
-                       net_vsp_after=new_net, usdc_reserves_after=new_reserves,
-                       vsp_circulating_after=new_circ)
+            # Trade fee is tracked separately from reserves
+            _record_trade(db, side="sell", user_address=req.user_address,
+                          qty_vsp=req.qty_vsp, total_usdc=fill.total_usd,
+                          avg_price_usd=fill.avg_price_usd, fee_usdc=fee_usdc,
+                          net_vsp_before=net_vsp, net_vsp_after=new_net,
+                          usdc_reserves_after=new_reserves, vsp_circulating_after=new_circ)
 
         return {"ok": True, "qty_vsp": req.qty_vsp,
                 "fee_vsp": fee_info["fee_vsp"],
@@ -534,9 +566,7 @@ def mm_sell(req: MMTradeRequest, db: Session = Depends(get_db)):
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        print(f"MM sell error: {e}")
-        print(traceback.format_exc())
+        logger.exception("MM sell failed")
         raise HTTPException(500, f"Failed to sell VSP: {e}")
 
 
@@ -582,7 +612,7 @@ def mm_transfer(req: TransferRequest, db: Session = Depends(get_db)):
     from web3 import Web3
     from_addr = Web3.to_checksum_address(req.from_address)
     to_addr = Web3.to_checksum_address(req.to_address)
-    amount_wei = int(req.amount_vsp * 10**18)
+    amount_wei = _vsp_to_wei(req.amount_vsp)
 
     # Execute the permit (grants MM allowance to transferFrom)
     if req.permit:
@@ -4,9 +4,14 @@ from __future__ import annotations
 import os
 import time
 import re
-from typing import Optional, Dict, Tuple
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeout
+from typing import Dict, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 # ============================================================
@@ -16,180 +21,214 @@ import requests
 GOLDAPI_TOKEN = os.getenv("GOLDAPI_TOKEN", "").strip()
 METALPRICEAPI_TOKEN = os.getenv("METALPRICEAPI_TOKEN", "").strip()
 
-GOLDAPI_MIN_PERIOD = int(os.getenv("GOLDAPI_MIN_PERIOD", "300"))      # seconds
-GOLDAPI_MAX_PERIOD = int(os.getenv("GOLDAPI_MAX_PERIOD", "3600"))
-
-METAL_MIN_PERIOD = int(os.getenv("METALPRICEAPI_MIN_PERIOD", "300"))
+# How long a fetched price is served before the source is asked again
+GOLDAPI_MAX_PERIOD = int(os.getenv("GOLDAPI_MAX_PERIOD", "3600"))    # seconds
 METAL_MAX_PERIOD = int(os.getenv("METALPRICEAPI_MAX_PERIOD", "3600"))
-
-KITCO_MIN_PERIOD = int(os.getenv("KITCO_MIN_PERIOD", "300"))
 KITCO_MAX_PERIOD = int(os.getenv("KITCO_MAX_PERIOD", "3600"))
 
 HTTP_TIMEOUT = 6.0  # seconds
+# How long GoldAPI gets on its own before the fallbacks are fired
+HEDGE_DELAY = 1.0  # seconds
 
 MIN_GOLD_PRICE = 500.0
 MAX_GOLD_PRICE = 10_000.0
 
 
-# ============================================================
-# In-memory cache
-# ============================================================
-
-_cache: Dict[str, Tuple[float, float]] = {}
-# key -> (price, timestamp)
-
+# Shared session: keeps TLS connections to the price sources alive
+# across cache refreshes instead of handshaking on every fetch.
+# Only connection errors are retried: a read timeout already cost
+# HTTP_TIMEOUT and the other sources are racing it.
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4, pool_maxsize=8,
+    max_retries=Retry(total=1, read=0, backoff_factor=0.2),
+)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
 
-def _now() -> float:
-    return time.time()
 
+# ============================================================
+# Validation
+# ============================================================
 
 def _valid_gold_price(p: Optional[float]) -> bool:
     return isinstance(p, (int, float)) and MIN_GOLD_PRICE < p < MAX_GOLD_PRICE
 
 
-def _get_cached(
-    key: str, min_period: int, max_period: int
-) -> Optional[float]:
-    if key not in _cache:
-        return None
-
-    price, ts = _cache[key]
-    age = _now() - ts
-
-    if age < min_period:
-        return price
+# ============================================================
+# GoldAPI
+# ============================================================
 
-    if age > max_period:
-        return None
+def _fetch_goldapi() -> float:
+    if not GOLDAPI_TOKEN:
+        raise ValueError("GOLDAPI_TOKEN not set")
 
-    return price
+    r = _session.get(
+        "https://www.goldapi.io/api/XAU/USD",
+        headers={"x-access-token": GOLDAPI_TOKEN},
+        timeout=HTTP_TIMEOUT,
+    )
+    r.raise_for_status()
 
+    price = r.json().get("price")
+    if not _valid_gold_price(price):
+        raise ValueError(f"goldapi: invalid price {price!r}")
 
-def _set_cache(key: str, price: float):
-    _cache[key] = (price, _now())
+    return float(price)
 
 
 # ============================================================
-# GoldAPI
+# MetalPriceAPI
 # ============================================================
 
-def _gold_from_goldapi() -> Optional[float]:
-    cached = _get_cached("goldapi", GOLDAPI_MIN_PERIOD, GOLDAPI_MAX_PERIOD)
-    if cached is not None:
-        return cached
-
-    if not GOLDAPI_TOKEN:
-        return None
+def _fetch_metalpriceapi() -> float:
+    if not METALPRICEAPI_TOKEN:
+        raise ValueError("METALPRICEAPI_TOKEN not set")
 
-    try:
-        r = requests.get(
-            "https://www.goldapi.io/api/XAU/USD",
-            headers={"x-access-token": GOLDAPI_TOKEN},
-            timeout=HTTP_TIMEOUT,
-        )
+    r = _session.get(
+        "https://api.metalpriceapi.com/v1/latest",
+        params={
+            "api_key": METALPRICEAPI_TOKEN,
+            "base": "USD",
+            "currencies": "XAU",
+        },
+        timeout=HTTP_TIMEOUT,
+    )
+    r.raise_for_status()
 
-        if r.status_code != 200:
-            return None
+    rates = r.json().get("rates", {})
+    xau_per_usd = rates.get("XAU")
 
-        price = r.json().get("price")
-        if not _valid_gold_price(price):
-            return None
+    if not isinstance(xau_per_usd, (int, float)) or xau_per_usd <= 0:
+        raise ValueError(f"metalpriceapi: invalid XAU rate {xau_per_usd!r}")
 
-        price = float(price)
-        _set_cache("goldapi", price)
-        return price
+    usd_per_xau = 1.0 / float(xau_per_usd)
+    if not _valid_gold_price(usd_per_xau):
+        raise ValueError(f"metalpriceapi: invalid price {usd_per_xau!r}")
 
-    except Exception:
-        return None
+    return usd_per_xau
 
 
 # ============================================================
-# MetalPriceAPI
+# Kitco (HTML scrape, regex-based — mirrors your Node code)
 # ============================================================
 
-def _gold_from_metalpriceapi() -> Optional[float]:
-    cached = _get_cached("metalpriceapi", METAL_MIN_PERIOD, METAL_MAX_PERIOD)
-    if cached is not None:
-        return cached
+_KITCO_MARKER = b"Bid</div>"
+_KITCO_WINDOW = 512  # bytes after the marker that can hold the price
+_KITCO_REGEX = re.compile(
+    rb"Bid</div><div class=\"mb-2 text-right\"><h3 class=\"[^\"]*\">"
+    rb"(\d{1,3}(?:,\d{3})*\.\d{2})"
+)
 
-    if not METALPRICEAPI_TOKEN:
-        return None
 
-    try:
-        r = requests.get(
-            "https://api.metalpriceapi.com/v1/latest",
-            params={
-                "api_key": METALPRICEAPI_TOKEN,
-                "base": "USD",
-                "currencies": "XAU",
-            },
-            timeout=HTTP_TIMEOUT,
-        )
+def _kitco_bid(html: bytes) -> Optional[str]:
+    """Find the bid price by locating the marker with bytes.find and
+    matching only a short window there, instead of regex-scanning the
+    whole decoded page."""
+    idx = html.find(_KITCO_MARKER)
+    while idx >= 0:
+        m = _KITCO_REGEX.match(html, idx, idx + _KITCO_WINDOW)
+        if m:
+            return m.group(1).decode("ascii")
+        idx = html.find(_KITCO_MARKER, idx + 1)
+    return None
+
+
+def _fetch_kitco() -> float:
+    r = _session.get(
+        "https://www.kitco.com/charts/gold",
+        timeout=HTTP_TIMEOUT,
+        headers={
+            "User-Agent": "Mozilla/5.0",
+            "Accept": "text/html",
+        },
+        allow_redirects=True,
+    )
+    r.raise_for_status()
+
+    bid = _kitco_bid(r.content)
+    if bid is None:
+        raise ValueError("kitco: bid price not found")
+
+    raw = bid.replace(",", "")
+    price = float(raw) + 0.5  # matches your Node logic
+
+    if not _valid_gold_price(price):
+        raise ValueError(f"kitco: invalid price {price!r}")
 
-        if r.status_code != 200:
-            return None
+    return price
 
-        rates = r.json().get("rates", {})
-        xau_per_usd = rates.get("XAU")
 
-        if not isinstance(xau_per_usd, (int, float)) or xau_per_usd <= 0:
-            return None
+# ============================================================
+# Time-bucketed cache
+# ============================================================
+#
+# A successful fetch is cached for the rest of its time bucket
+# (now // period). Fetchers raise on failure and failures are not
+# cached, so a failed source is retried on the next call.
+# Buckets use the MAX period: the previous dict cache also kept serving
+# a price until MAX_PERIOD before refetching. Buckets are aligned to the
+# wall clock (epoch multiples of the period), not to the last fetch, so
+# a price fetched late in a bucket is refreshed at the next boundary.
 
-        usd_per_xau = 1.0 / float(xau_per_usd)
-        if not _valid_gold_price(usd_per_xau):
-            return None
+_SOURCES = {
+    "goldapi":       (_fetch_goldapi, GOLDAPI_MAX_PERIOD),
+    "metalpriceapi": (_fetch_metalpriceapi, METAL_MAX_PERIOD),
+    "kitco":         (_fetch_kitco, KITCO_MAX_PERIOD),
+}
 
-        _set_cache("metalpriceapi", usd_per_xau)
-        return usd_per_xau
+# Resolution order; a lower-priority price is only used when every
+# source ahead of it has failed.
+_PRIORITY = ("goldapi", "metalpriceapi", "kitco")
+
+# source -> (bucket, price) of the last good fetch
+_prices: Dict[str, Tuple[int, float]] = {}
+
+
+def _bucket(source: str) -> int:
+    return int(time.time()) // _SOURCES[source][1]
 
-    except Exception:
-        return None
+
+def _cached_price(source: str) -> Optional[float]:
+    """Price from the current bucket, without touching the network."""
+    entry = _prices.get(source)
+    if entry is not None and entry[0] == _bucket(source):
+        return entry[1]
+    return None
 
 
 # ============================================================
-# Kitco (HTML scrape, regex-based — mirrors your Node code)
+# Single-flight fetches
 # ============================================================
+#
+# At most one fetch per source is in flight; concurrent callers that
+# miss the cache share its future instead of queueing fetches of their
+# own. That bounds the pool's work to one task per source, so three
+# workers always have room for the fallbacks.
 
-_KITCO_REGEX = re.compile(
-    r"Bid</div><div class=\"mb-2 text-right\"><h3 class=\".*?\">"
-    r"(\d{1,3}(?:,\d{3})*\.\d{2})"
-)
+_executor = ThreadPoolExecutor(max_workers=len(_SOURCES), thread_name_prefix="gold-oracle")
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
 
 
-def _gold_from_kitco() -> Optional[float]:
-    cached = _get_cached("kitco", KITCO_MIN_PERIOD, KITCO_MAX_PERIOD)
-    if cached is not None:
-        return cached
-
+def _fetch_and_store(source: str) -> Optional[float]:
     try:
-        r = requests.get(
-            "https://www.kitco.com/charts/gold",
-            timeout=HTTP_TIMEOUT,
-            headers={
-                "User-Agent": "Mozilla/5.0",
-                "Accept": "text/html",
-            },
-            allow_redirects=True,
-        )
-
-        if r.status_code != 200:
-            return None
-
-        m = _KITCO_REGEX.search(r.text)
-        if not m:
-            return None
-
-        raw = m.group(1).replace(",", "")
-        price = float(raw) + 0.5  # matches your Node logic
-
-        if not _valid_gold_price(price):
-            return None
-
-        _set_cache("kitco", price)
+        price = _SOURCES[source][0]()
+        _prices[source] = (_bucket(source), price)
         return price
-
     except Exception:
         return None
+    finally:
+        with _inflight_lock:
+            _inflight.pop(source, None)
+
+
+def _price_future(source: str) -> Future:
+    with _inflight_lock:
+        fut = _inflight.get(source)
+        if fut is None:
+            fut = _inflight[source] = _executor.submit(_fetch_and_store, source)
+        return fut
 
 
 # ============================================================
@@ -203,15 +242,41 @@ def get_gold_price_usd_per_oz() -> float:
     2) MetalPriceAPI
     3) Kitco HTML scrape
 
+    A cached GoldAPI price returns inline. Otherwise GoldAPI is fetched
+    and, if it fails or is still waiting on the network after
+    HEDGE_DELAY, the fallbacks are fetched alongside it. The answer is
+    still the first valid price in the order above; overlapping the
+    fetches only stops a slow source adding its full timeout to the
+    others.
+
     Hard-fail if all unavailable.
     """
 
-    for fn in (
-        _gold_from_goldapi,
-        _gold_from_metalpriceapi,
-        _gold_from_kitco,
-    ):
-        price = fn()
+    price = _cached_price("goldapi")
+    if price is not None:
+        return price
+
+    pending = {"goldapi": _price_future("goldapi")}
+    try:
+        price = pending["goldapi"].result(timeout=HEDGE_DELAY)
+        if price is not None:
+            return price
+    except FuturesTimeout:
+        pass
+
+    for source in _PRIORITY[1:]:
+        if _cached_price(source) is None:
+            pending[source] = _price_future(source)
+
+    deadline = time.monotonic() + HTTP_TIMEOUT + 1.0
+    for source in _PRIORITY:
+        price = _cached_price(source)
+        if price is None and source in pending:
+            try:
+                price = pending[source].result(
+                    timeout=max(0.0, deadline - time.monotonic()))
+            except FuturesTimeout:
+                price = None
         if price is not None:
             return price
 
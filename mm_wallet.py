@@ -1,4 +1,6 @@
 # app/mm_wallet.py
+import time
+
 from web3 import Web3
 from eth_account import Account
 from config import RPC_URL, MM_PRIVATE_KEY, MM_ADDRESS
@@ -24,21 +26,42 @@ account = Account.from_key(MM_PRIVATE_KEY)
 if account.address.lower() != MM_ADDRESS.lower():
     raise RuntimeError("MM_PRIVATE_KEY does not match MM_ADDRESS")
 
+# Fixed for the life of the process — read once instead of per tx
+_CHAIN_ID = w3.eth.chain_id
+_ACCOUNT_ADDRESS = account.address
+
+# (timestamp, base_fee, priority) — about two Avalanche blocks
+_FEE_TTL = 4.0
+_fee_cache = None
+
+
+def _get_fees() -> tuple[int, int]:
+    global _fee_cache
+    now = time.time()
+    if _fee_cache is None or now - _fee_cache[0] > _FEE_TTL:
+        base_fee = w3.eth.get_block("latest").baseFeePerGas
+        priority = w3.eth.max_priority_fee * 150 // 100
+        _fee_cache = (now, base_fee, priority)
+    return _fee_cache[1], _fee_cache[2]
+
+
 def sign_and_send(tx: dict) -> str:
     tx = dict(tx)
     tx.pop("gasPrice", None)
 
     try:
-        base_fee = w3.eth.get_block("latest").baseFeePerGas
-        priority = w3.eth.max_priority_fee * 150 // 100
+        base_fee, priority = _get_fees()
         tx["type"] = 2
-        tx["maxFeePerGas"] = base_fee + priority
+        # base_fee may be up to _FEE_TTL old; 2x headroom keeps the tx
+        # includable through several full blocks of base-fee increases.
+        # Only the actual base fee is charged, so this costs nothing.
+        tx["maxFeePerGas"] = 2 * base_fee + priority
         tx["maxPriorityFeePerGas"] = priority
     except Exception:
         tx["gasPrice"] = w3.eth.gas_price * 120 // 100
 
-    tx["nonce"] = w3.eth.get_transaction_count(account.address, "pending")
-    tx["chainId"] = w3.eth.chain_id
+    tx["nonce"] = w3.eth.get_transaction_count(_ACCOUNT_ADDRESS, "pending")
+    tx["chainId"] = _CHAIN_ID
 
     if "gas" not in tx:
         try:
@@ -15,9 +15,11 @@ The chain itself is unmoderated — this is app-layer policy only.
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
 import json
+import threading
 from dataclasses import dataclass
 from typing import Optional
 
@@ -124,12 +126,51 @@ def _circuit_breaker_record_failure():
         )
 
 
+# LLM verdict cache. The frontend's /moderate pre-check and the relay gate
+# see the same claim text moments apart, so a verdict is reused for an
+# hour instead of paying a second LLM call. Failures are never cached.
+_VERDICT_TTL = 3600
+_VERDICT_MAX = 1024
+_verdicts: dict[bytes, tuple[Optional[str], float]] = {}
+_verdicts_lock = threading.Lock()
+
+
+def _verdict_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def _cached_verdict(key: bytes):
+    """Returns (hit, reason)."""
+    with _verdicts_lock:
+        entry = _verdicts.get(key)
+        if entry is None:
+            return False, None
+        reason, ts = entry
+        if _time.time() - ts >= _VERDICT_TTL:
+            del _verdicts[key]
+            return False, None
+        return True, reason
+
+
+def _remember_verdict(key: bytes, reason: Optional[str]) -> None:
+    with _verdicts_lock:
+        _verdicts.pop(key, None)
+        _verdicts[key] = (reason, _time.time())
+        if len(_verdicts) > _VERDICT_MAX:
+            del _verdicts[next(iter(_verdicts))]
+
+
 def _llm_check(text: str) -> Optional[str]:
     """
     Tier 2: LLM-based policy check with circuit breaker.
     Returns rejection reason or None if clean.
     Falls back to keyword-only if LLM is consistently failing.
     """
+    key = _verdict_key(text)
+    hit, reason = _cached_verdict(key)
+    if hit:
+        return reason
+
     if not _circuit_breaker_check():
         # Circuit open — skip LLM, rely on keyword filter only
         return None
@@ -147,8 +188,11 @@ def _llm_check(text: str) -> Optional[str]:
         result = json.loads(clean)
 
         if result.get("allowed", True):
-            return None
-        return result.get("reason", "Content violates community standards.")
+            reason = None
+        else:
+            reason = result.get("reason", "Content violates community standards.")
+        _remember_verdict(key, reason)
+        return reason
 
     except Exception as e:
         logger.warning(f"LLM moderation failed: {e}")
@@ -0,0 +1,56 @@
+-- Migration: 190_claim_embedding_onchain_index.sql
+-- Partial HNSW index over the on-chain subset of claim_embedding.
+--
+-- Why: on-chain lookups (semantic.find_best_onchain_match /
+-- find_all_onchain_matches) filter on claim.post_id IS NOT NULL and order
+-- by cosine distance. Only a small fraction of claims are on-chain, so an
+-- ANN scan over every embedding spends its ef_search budget on rows the
+-- filter then discards. Index predicates must be immutable and cannot
+-- reference another table, so the on-chain flag is denormalized onto
+-- claim_embedding and kept in sync by triggers.
+
+ALTER TABLE claim_embedding
+    ADD COLUMN IF NOT EXISTS post_id_present BOOLEAN NOT NULL DEFAULT FALSE;
+
+-- Backfill
+UPDATE claim_embedding e
+SET post_id_present = TRUE
+FROM claim c
+WHERE c.claim_id = e.claim_id
+  AND c.post_id IS NOT NULL
+  AND NOT e.post_id_present;
+
+-- claim.post_id changes → claim_embedding.post_id_present
+CREATE OR REPLACE FUNCTION claim_sync_post_id_present() RETURNS trigger AS $$
+BEGIN
+    UPDATE claim_embedding
+    SET post_id_present = (NEW.post_id IS NOT NULL)
+    WHERE claim_id = NEW.claim_id
+      AND post_id_present IS DISTINCT FROM (NEW.post_id IS NOT NULL);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_claim_post_id_present ON claim;
+CREATE TRIGGER trg_claim_post_id_present
+    AFTER UPDATE OF post_id ON claim
+    FOR EACH ROW EXECUTE FUNCTION claim_sync_post_id_present();
+
+-- New embedding rows inherit the flag from their claim
+CREATE OR REPLACE FUNCTION claim_embedding_init_post_id_present() RETURNS trigger AS $$
+BEGIN
+    NEW.post_id_present := COALESCE(
+        (SELECT c.post_id IS NOT NULL FROM claim c WHERE c.claim_id = NEW.claim_id),
+        FALSE);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_claim_embedding_post_id_present ON claim_embedding;
+CREATE TRIGGER trg_claim_embedding_post_id_present
+    BEFORE INSERT ON claim_embedding
+    FOR EACH ROW EXECUTE FUNCTION claim_embedding_init_post_id_present();
+
+CREATE INDEX IF NOT EXISTS idx_claim_embedding_onchain_hnsw ON claim_embedding
+    USING hnsw (embedding vector_cosine_ops)
+    WHERE post_id_present;
@@ -0,0 +1,10 @@
+-- Migration: 200_claim_embedding_hnsw.sql
+-- HNSW index over every claim embedding.
+--
+-- Why: semantic.compute_one ranks all claims by cosine distance to the
+-- query claim. Without an ANN index each call is a sequential scan over
+-- claim_embedding. 190 only indexes the on-chain subset.
+
+CREATE INDEX IF NOT EXISTS idx_claim_embedding_hnsw ON claim_embedding
+    USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
@@ -0,0 +1,16 @@
+-- Migration: 210_claim_content_hash_bytea.sql
+-- Store claim.content_hash as the raw 32-byte SHA-256 instead of 64 hex chars.
+--
+-- Why: every ensure_claim / indexer lookup is an equality probe on the
+-- UNIQUE content_hash index. bytea keys are half the size of their hex
+-- text and compare with memcmp rather than collation-aware text equality.
+-- The application now binds hashing.content_digest() bytes.
+
+DO $$
+BEGIN
+    IF (SELECT data_type FROM information_schema.columns
+        WHERE table_name = 'claim' AND column_name = 'content_hash') = 'text' THEN
+        ALTER TABLE claim
+            ALTER COLUMN content_hash TYPE BYTEA USING decode(content_hash, 'hex');
+    END IF;
+END $$;
@@ -4,23 +4,26 @@ Gasless meta-transaction relay.
 Pattern: submit tx -> wait for receipt -> update DB -> return authoritative state.
 """
 
+import asyncio
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
+from sqlalchemy import text as sql_text
 from sqlalchemy.orm import Session
 from web3 import Web3
 from chain_indexer import trigger_reindex
-from web3.logs import DISCARD
 
-from config import FORWARDER_ADDRESS, POST_REGISTRY_ADDRESS
+from config import FORWARDER_ADDRESS, POST_REGISTRY_ADDRESS, STAKE_ENGINE_ADDRESS
 from db import get_db
 from mm_wallet import w3, sign_and_send
 from fee_calculator import compute_relay_fee, is_fee_exempt
-from config import VSP_ADDRESS, MM_ADDRESS as FEE_WALLET
+from config import VSP_ADDRESS, MM_ADDRESS, RELAY_POLL_LATENCY, RELAY_WORKERS
 from moderation import check_content
+from claim_status_cache import invalidate_not_on_chain_cache
 from rate_limit import relay_rate_limit
 
 logger = logging.getLogger(__name__)
@@ -39,9 +42,9 @@ _VSP_FEE_ABI = [
      "stateMutability":"view","type":"function"},
 ]
 
-def _detect_tx_type(calldata_hex, to_addr):
-    """Detect transaction type and value from calldata."""
-    sel = calldata_hex[:8]
+def _detect_tx_type(calldata, to_addr):
+    """Detect transaction type and value from calldata bytes."""
+    sel = calldata[:4].hex()
     tx_type = "unknown"
     tx_value_vsp = 0
     if sel == "84c08ed3":  # createClaim(string)
@@ -52,14 +55,14 @@ def _detect_tx_type(calldata_hex, to_addr):
         tx_type = "stake"
         try:
             from eth_abi import decode
-            _, _, amt = decode(["uint256","uint8","uint256"], bytes.fromhex(calldata_hex[8:]))
+            _, _, amt = decode(["uint256","uint8","uint256"], calldata[4:])
             tx_value_vsp = amt / 1e18
         except: pass
     elif sel == "97be5523" or sel == "441a3e70":  # withdraw variants
         tx_type = "unstake"
         try:
             from eth_abi import decode
-            _, _, amt, _ = decode(["uint256","uint8","uint256","bool"], bytes.fromhex(calldata_hex[8:]))
+            _, _, amt, _ = decode(["uint256","uint8","uint256","bool"], calldata[4:])
             tx_value_vsp = amt / 1e18
         except: pass
     elif sel == "095ea7b3":  # approve
@@ -68,7 +71,7 @@ def _detect_tx_type(calldata_hex, to_addr):
         tx_type = "transfer"
         try:
             from eth_abi import decode
-            _, amt = decode(["address","uint256"], bytes.fromhex(calldata_hex[8:]))
+            _, amt = decode(["address","uint256"], calldata[4:])
             tx_value_vsp = amt / 1e18
         except: pass
     return tx_type, tx_value_vsp
@@ -116,6 +119,11 @@ router = APIRouter()
 
 RECEIPT_TIMEOUT = 30
 
+# A relay holds its thread through sign_and_send's receipt wait and ours,
+# so relays get their own pool instead of exhausting the default executor
+# that MM trades and the claim endpoints share via asyncio.to_thread.
+_relay_executor = ThreadPoolExecutor(max_workers=RELAY_WORKERS, thread_name_prefix="relay")
+
 # Error selectors
 DUPLICATE_CLAIM_SELECTOR = "c314bc02"
 
@@ -123,8 +131,7 @@ DUPLICATE_CLAIM_SELECTOR = "c314bc02"
 def _load_abi(name):
     path = Path(f"/core/out/{name}.sol/{name}.json")
     if path.exists():
-        with open(path) as f:
-            return json.load(f)["abi"]
+        return json.loads(path.read_bytes())["abi"]
     return None
 
 
@@ -155,8 +162,19 @@ POST_REGISTRY_ABI = _load_abi("PostRegistry") or [
     ]},
 ]
 
+def _event_topic(abi, name):
+    """topic0 for the named event in abi, or None if it is not there."""
+    for e in abi:
+        if e.get("type") == "event" and e.get("name") == name:
+            return Web3.keccak(text=f"{name}({','.join(i['type'] for i in e['inputs'])})")
+    return None
+
+
+_POST_CREATED_TOPIC = _event_topic(POST_REGISTRY_ABI, "PostCreated")
+
 # Function selectors (first 4 bytes of keccak256)
 CREATE_CLAIM_SELECTOR = "4a3e1b89"
+_CREATE_CLAIM_SEL = bytes.fromhex(CREATE_CLAIM_SELECTOR)
 
 
 class ForwardRequestPayload(BaseModel):
@@ -192,8 +210,19 @@ class NonceResponse(BaseModel):
     nonce: int
 
 
+def _checksum_or_empty(addr: str) -> str:
+    return Web3.to_checksum_address(addr) if addr else ""
+
+
+# Checksummed once at import; compared against per request
+_FORWARDER_ADDR_CS = _checksum_or_empty(FORWARDER_ADDRESS)
+_POST_REGISTRY_ADDR_CS = _checksum_or_empty(POST_REGISTRY_ADDRESS)
+_STAKE_ENGINE_ADDR_CS = _checksum_or_empty(STAKE_ENGINE_ADDRESS)
+_VSP_ADDR_CS = _checksum_or_empty(VSP_ADDRESS)
+_MM_ADDR_CS = _checksum_or_empty(MM_ADDRESS)
+
 _forwarder = None
-_post_registry = None
+_vsp_fee_contract = None
 
 
 def _get_forwarder():
@@ -201,31 +230,40 @@ def _get_forwarder():
     if _forwarder is None:
         if not FORWARDER_ADDRESS:
             raise HTTPException(500, "Forwarder address not configured")
-        _forwarder = w3.eth.contract(
-            address=Web3.to_checksum_address(FORWARDER_ADDRESS), abi=FORWARDER_ABI)
+        _forwarder = w3.eth.contract(address=_FORWARDER_ADDR_CS, abi=FORWARDER_ABI)
     return _forwarder
 
 
-def _get_post_registry():
-    global _post_registry
-    if _post_registry is None:
-        _post_registry = w3.eth.contract(
-            address=Web3.to_checksum_address(POST_REGISTRY_ADDRESS), abi=POST_REGISTRY_ABI)
-    return _post_registry
+def _get_vsp_fee_contract():
+    global _vsp_fee_contract
+    if _vsp_fee_contract is None:
+        _vsp_fee_contract = w3.eth.contract(address=_VSP_ADDR_CS, abi=_VSP_FEE_ABI)
+    return _vsp_fee_contract
+
+
+def _post_created_id(receipt):
+    """postId of the PostRegistry's PostCreated log in receipt, or None.
+    postId is the event's first indexed argument, so it is read straight
+    from topics[1] without ABI-decoding the log."""
+    for log in receipt.logs:
+        topics = log["topics"]
+        if (len(topics) > 1 and topics[0] == _POST_CREATED_TOPIC
+                and log["address"] == _POST_REGISTRY_ADDR_CS):
+            return int.from_bytes(topics[1], "big")
+    return None
 
 
-def _decode_claim_text(calldata_hex):
-    """Decode claim text from createClaim(string) calldata."""
-    data = bytes.fromhex(calldata_hex)
-    offset = int.from_bytes(data[4:36], "big")
+def _decode_claim_text(data: bytes) -> str:
+    """Decode claim text from createClaim(string) calldata bytes."""
+    mv = memoryview(data)  # slices are views; only the string is copied
+    offset = int.from_bytes(mv[4:36], "big")
     str_start = 4 + offset
-    str_len = int.from_bytes(data[str_start:str_start + 32], "big")
-    return data[str_start + 32:str_start + 32 + str_len].decode("utf-8")
+    str_len = int.from_bytes(mv[str_start:str_start + 32], "big")
+    return str(mv[str_start + 32:str_start + 32 + str_len], "utf-8")
 
 
 def _mark_claim_on_chain(db, claim_text, post_id):
     from semantic import ensure_claim, get_post_id
-    from sqlalchemy import text as sql_text
     cid = ensure_claim(db, claim_text)
     existing = get_post_id(db, cid)
     if existing is None:
@@ -233,48 +271,41 @@ def _mark_claim_on_chain(db, claim_text, post_id):
             "UPDATE claim SET post_id = :pid WHERE claim_id = :cid"
         ), {"pid": post_id, "cid": cid})
         db.commit()
+        invalidate_not_on_chain_cache()
         logger.info("Marked claim on-chain: claim_id=%d post_id=%d", cid, post_id)
 
 
 def _get_claim_state(post_id, user_address=None):
     from db import get_session_factory
-    from chain.chain_db import get_stake_totals, get_user_stake
+    from chain.chain_db import get_claim_state
     _db = get_session_factory()()
     try:
-        support, challenge = get_stake_totals(_db, post_id)
-        result = {
+        state = get_claim_state(_db, post_id, user_address)
+        return {
             "post_id": post_id,
             "text": "",
             "creator": "",
-            "support_total": support,
-            "challenge_total": challenge,
-            "user_support": 0,
-            "user_challenge": 0,
+            "support_total": state["support"],
+            "challenge_total": state["challenge"],
+            "user_support": state["user_support"],
+            "user_challenge": state["user_challenge"],
         }
-        if user_address:
-            try:
-                result["user_support"] = get_user_stake(_db, user_address, post_id, 0)
-                result["user_challenge"] = get_user_stake(_db, user_address, post_id, 1)
-            except Exception:
-                pass
-        return result
     finally:
         _db.close()
 
 
-def _check_duplicate_claim(calldata_hex, req_from, db):
+def _check_duplicate_claim(calldata, req_from, db):
     """
     Do a static call to createClaim. If it reverts with DuplicateClaim(postId),
     recover the existing post_id and return a success response.
     """
     try:
-        claim_text = _decode_claim_text(calldata_hex)
-        reg_address = Web3.to_checksum_address(POST_REGISTRY_ADDRESS)
+        claim_text = _decode_claim_text(calldata)
         try:
             w3.eth.call({
-                "to": reg_address,
+                "to": _POST_REGISTRY_ADDR_CS,
                 "from": Web3.to_checksum_address(req_from),
-                "data": "0x" + calldata_hex,
+                "data": calldata,
             })
             return None
         except Exception as call_err:
@@ -356,7 +387,7 @@ def _execute_permit(permit):
         "type": "function",
     }]
     contract = w3.eth.contract(address=token_addr, abi=permit_abi)
-    mm_addr = Web3.to_checksum_address(__import__("config").MM_ADDRESS)
+    mm_addr = _MM_ADDR_CS
 
     # Debug: log permit details
     logger.info("Executing permit: token=%s owner=%s spender=%s value=%d deadline=%d v=%d",
@@ -382,20 +413,20 @@ def _execute_permit(permit):
     ).build_transaction({"from": mm_addr, "gas": 120_000})
 
     tx_hash = sign_and_send(tx)
-    receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=30)
+    receipt = w3.eth.wait_for_transaction_receipt(
+        tx_hash, timeout=30, poll_latency=RELAY_POLL_LATENCY)
     if receipt.status == 0:
         raise HTTPException(400, "Permit transaction reverted on-chain")
     logger.info("Permit executed: token=%s owner=%s spender=%s tx=%s",
                 permit.token[:10], permit.owner[:10], permit.spender[:10], tx_hash)
 
 
-def _moderate_claim(calldata_hex: str) -> None:
+def _moderate_claim(calldata: bytes) -> None:
     """Check if createClaim calldata contains blocked content. Raises HTTPException if blocked."""
     try:
-        selector = calldata_hex[:8]
-        if selector.lower() != CREATE_CLAIM_SELECTOR:
+        if calldata[:4] != _CREATE_CLAIM_SEL:
             return  # Not a createClaim call, skip moderation
-        claim_text = _decode_claim_text(calldata_hex)
+        claim_text = _decode_claim_text(calldata)
         result = check_content(claim_text)
         if not result.allowed:
             raise HTTPException(400, f"Content blocked: {result.reason}")
@@ -445,9 +476,9 @@ async def estimate_fee(to: str, calldata: str, db: Session = Depends(get_db)):
 @router.post("/api/relay")
 @relay_rate_limit
 async def relay(body: RelayRequest, db: Session = Depends(get_db)):
-    """Relay meta-transaction. Runs blocking RPC/chain calls in a thread pool."""
-    import asyncio
-    return await asyncio.to_thread(_relay_sync, body, db)
+    """Relay meta-transaction. Runs blocking RPC/chain calls in the relay pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_relay_executor, _relay_sync, body, db)
 
 def _relay_sync(body: RelayRequest, db: Session):
     try:
@@ -457,15 +488,17 @@ def _relay_sync(body: RelayRequest, db: Session):
         import time as _t; _relay_t0 = _t.time()
         print(f"TIMING: relay start", flush=True)
         sig_bytes = bytes.fromhex(body.signature.removeprefix("0x"))
-        calldata_hex = req.data.removeprefix("0x")
+        calldata = bytes.fromhex(req.data.removeprefix("0x"))
+        from_cs = Web3.to_checksum_address(req.from_)
+        to_cs = Web3.to_checksum_address(req.to)
 
         request_data = (
-            Web3.to_checksum_address(req.from_),
-            Web3.to_checksum_address(req.to),
+            from_cs,
+            to_cs,
             req.value,
             req.gas,
             req.deadline,
-            bytes.fromhex(calldata_hex),
+            calldata,
             sig_bytes,
         )
 
@@ -482,7 +515,7 @@ def _relay_sync(body: RelayRequest, db: Session):
                 logger.debug("Fee permit skip (non-fatal): %s", e)
 
         # Content moderation gate
-        _moderate_claim(calldata_hex)
+        _moderate_claim(calldata)
 
         # Verify signature
         try:
@@ -500,13 +533,13 @@ def _relay_sync(body: RelayRequest, db: Session):
 
         # Check if this is a createClaim call
         is_create = (
-            req.to.lower() == POST_REGISTRY_ADDRESS.lower()
-            and calldata_hex[:8] == CREATE_CLAIM_SELECTOR
+            to_cs == _POST_REGISTRY_ADDR_CS
+            and calldata[:4] == _CREATE_CLAIM_SEL
         )
 
         # Pre-flight: for createClaim, check for duplicate BEFORE wasting gas
         if is_create:
-            dup = _check_duplicate_claim(calldata_hex, req.from_, db)
+            dup = _check_duplicate_claim(calldata, req.from_, db)
             if dup:
                 logger.info("Pre-flight: claim already exists on-chain, returning existing")
                 return dup
@@ -516,9 +549,9 @@ def _relay_sync(body: RelayRequest, db: Session):
         if not is_create:
             try:
                 w3.eth.call({
-                    "from": Web3.to_checksum_address(req.from_),
-                    "to": Web3.to_checksum_address(req.to),
-                    "data": "0x" + calldata_hex,
+                    "from": from_cs,
+                    "to": to_cs,
+                    "data": calldata,
                     "value": req.value,
                 })
             except Exception as sim_err:
@@ -528,7 +561,7 @@ def _relay_sync(body: RelayRequest, db: Session):
 
 
         # ── RELAY FEE: blocking enforcement ──
-        user_addr = Web3.to_checksum_address(req.from_)
+        user_addr = from_cs
         fee_exempt = is_fee_exempt(db, req.from_)
         relay_fee_info = None
         
@@ -542,7 +575,7 @@ def _relay_sync(body: RelayRequest, db: Session):
                     raise HTTPException(400, f'Fee permit failed: {fp_err}')
         
             # Estimate gas
-            mm_addr = Web3.to_checksum_address(FEE_WALLET)
+            mm_addr = _MM_ADDR_CS
             try:
                 print(f"TIMING: estimate_gas start {_t.time()-_relay_t0:.1f}s", flush=True)
                 gas_estimate = fwd.functions.execute(request_data).estimate_gas({
@@ -553,15 +586,15 @@ def _relay_sync(body: RelayRequest, db: Session):
                 gas_estimate = req.gas  # fallback to requested gas
         
             gas_price_wei = w3.eth.gas_price
-            tx_type, tx_value_vsp = _detect_tx_type(calldata_hex, req.to)
+            tx_type, tx_value_vsp = _detect_tx_type(calldata, req.to)
             relay_fee_info = compute_relay_fee(db, gas_estimate, gas_price_wei, tx_value_vsp)
             fee_wei = int(relay_fee_info['fee_vsp'] * 1e18)
         
             # Check balance and allowance
-            vsp_c = w3.eth.contract(address=Web3.to_checksum_address(VSP_ADDRESS), abi=_VSP_FEE_ABI)
+            vsp_c = _get_vsp_fee_contract()
             print(f"TIMING: balance check start {_t.time()-_relay_t0:.1f}s", flush=True)
             user_balance = vsp_c.functions.balanceOf(user_addr).call()
-            user_allowance = vsp_c.functions.allowance(user_addr, Web3.to_checksum_address(FORWARDER_ADDRESS)).call()
+            user_allowance = vsp_c.functions.allowance(user_addr, _FORWARDER_ADDR_CS).call()
         
             if user_balance < fee_wei:
                 raise HTTPException(400,
@@ -580,8 +613,7 @@ def _relay_sync(body: RelayRequest, db: Session):
         # Submit transaction
         print(f"TIMING: build_tx start {_t.time()-_relay_t0:.1f}s", flush=True)
         tx = fwd.functions.execute(request_data).build_transaction({
-            "from": w3.eth.default_account or Web3.to_checksum_address(
-                __import__("config").MM_ADDRESS),
+            "from": w3.eth.default_account or _MM_ADDR_CS,
             "value": req.value,
             "gas": req.gas + 800_000,
         })
@@ -590,7 +622,7 @@ def _relay_sync(body: RelayRequest, db: Session):
 
         # Wait for receipt
         try:
-            print(f"TIMING: wait_receipt start {_t.time()-_relay_t0:.1f}s", flush=True); receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=RECEIPT_TIMEOUT); print(f"TIMING: wait_receipt done {_t.time()-_relay_t0:.1f}s", flush=True)
+            print(f"TIMING: wait_receipt start {_t.time()-_relay_t0:.1f}s", flush=True); receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=RECEIPT_TIMEOUT, poll_latency=RELAY_POLL_LATENCY); print(f"TIMING: wait_receipt done {_t.time()-_relay_t0:.1f}s", flush=True)
         except Exception as e:
             logger.warning("Receipt timeout: %s", e)
             raise HTTPException(500,
@@ -602,7 +634,7 @@ def _relay_sync(body: RelayRequest, db: Session):
 
             # For createClaim reverts, try DuplicateClaim recovery
             if is_create:
-                dup = _check_duplicate_claim(calldata_hex, req.from_, db)
+                dup = _check_duplicate_claim(calldata, req.from_, db)
                 if dup:
                     dup["tx_hash"] = tx_hash
                     return dup
@@ -618,14 +650,13 @@ def _relay_sync(body: RelayRequest, db: Session):
         # Log relay fee
         if relay_fee_info:
             try:
-                import sqlalchemy
-                tx_type_final, _ = _detect_tx_type(calldata_hex, req.to)
-                db.execute(sqlalchemy.text(
+                tx_type_final, _ = _detect_tx_type(calldata, req.to)
+                db.execute(sql_text(
                     'UPDATE mm_state SET relay_fees_collected_vsp = '
                     'COALESCE(relay_fees_collected_vsp, 0) + :fee, '
                     'total_gas_spent_avax = COALESCE(total_gas_spent_avax, 0) + :gas'
                 ), {'fee': relay_fee_info['fee_vsp'], 'gas': relay_fee_info['gas_cost_avax']})
-                db.execute(sqlalchemy.text(
+                db.execute(sql_text(
                     'INSERT INTO relay_fee_log '
                     '(tx_hash, user_address, gas_estimated, gas_used, gas_price_gwei, '
                     'gas_cost_avax, gas_cost_usd, fee_charged_vsp, fee_margin_pct, tx_type) '
@@ -647,11 +678,9 @@ def _relay_sync(body: RelayRequest, db: Session):
         # Detect createClaim success
         if is_create:
             try:
-                reg = _get_post_registry()
-                logs = reg.events.PostCreated().process_receipt(receipt, errors=DISCARD)
-                if logs:
-                    post_id = logs[0].args.postId
-                    claim_text = _decode_claim_text(calldata_hex)
+                post_id = _post_created_id(receipt)
+                if post_id is not None:
+                    claim_text = _decode_claim_text(calldata)
                     _mark_claim_on_chain(db, claim_text, post_id)
                     # Incremental cache update: link this new claim to any article
                     # sentence with matching text
@@ -686,10 +715,9 @@ def _relay_sync(body: RelayRequest, db: Session):
                     # APP-10: Universal topic association
                     try:
                         from articles.topic_detect import detect_topic, ensure_article_for_claim
-                        _topic = detect_topic(claim_text)
+                        _topic = detect_topic(claim_text, db)
                         if _topic:
-                            from sqlalchemy import text as _sqlt
-                            db.execute(_sqlt(
+                            db.execute(sql_text(
                                 "UPDATE claim SET topic = :t WHERE post_id = :pid AND topic IS NULL"
                             ), {"t": _topic, "pid": post_id})
                             db.commit()
@@ -702,7 +730,7 @@ def _relay_sync(body: RelayRequest, db: Session):
                         from db import get_session_factory
                         from articles.article_store import build_and_cache_response
                         # Find which articles contain this post
-                        _art_rows = db.execute(__import__("sqlalchemy").text(
+                        _art_rows = db.execute(sql_text(
                             "SELECT DISTINCT ta.topic_key FROM article_sentence s "
                             "JOIN article_section sec ON s.section_id = sec.section_id "
                             "JOIN topic_article ta ON sec.article_id = ta.article_id "
@@ -721,14 +749,12 @@ def _relay_sync(body: RelayRequest, db: Session):
                 logger.warning("Post-create processing failed (non-fatal): %s", e)
 
         # Detect stake/withdraw (target is StakeEngine)
-        from config import STAKE_ENGINE_ADDRESS
-        is_stake = req.to.lower() == STAKE_ENGINE_ADDRESS.lower()
+        is_stake = to_cs == _STAKE_ENGINE_ADDR_CS
 
         if is_stake:
             try:
                 print(f"TIMING: stake post-processing start {_t.time()-_relay_t0:.1f}s", flush=True)
-                data = bytes.fromhex(calldata_hex)
-                post_id = int.from_bytes(data[4:36], "big")
+                post_id = int.from_bytes(memoryview(calldata)[4:36], "big")
                 claim_state = _get_claim_state(post_id, req.from_)
                 response["claim"] = claim_state
                 logger.info("Stake updated: post_id=%d", post_id)
@@ -752,7 +778,7 @@ def _relay_sync(body: RelayRequest, db: Session):
                 print(f"TIMING: reindex done {_t.time()-_relay_t0:.1f}s", flush=True)
                 # APP-11: Rebuild article caches in background (don't block response)
                 try:
-                    _art_rows = db.execute(__import__("sqlalchemy").text(
+                    _art_rows = db.execute(sql_text(
                         "SELECT DISTINCT ta.topic_key FROM article_sentence s "
                         "JOIN article_section sec ON s.section_id = sec.section_id "
                         "JOIN topic_article ta ON sec.article_id = ta.article_id "
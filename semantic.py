@@ -1,16 +1,23 @@
 # app/semantic.py
 from __future__ import annotations
+import logging
 import re
+import threading
 import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Any, Dict, List, Literal, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from hashing import content_hash
-from embedding import embed
-from similarity import cosine_similarity
+from hashing import content_digest, content_hash
+from embedding import embed, embed_batch
+import numpy as np
+from similarity import cosine_similarities
 from db import decode_embedding
 from config import EMBEDDINGS_MODEL, DUPLICATE_THRESHOLD, NEAR_DUPLICATE_THRESHOLD
 
+logger = logging.getLogger(__name__)
+
 Classification = Literal["duplicate", "near_duplicate", "new"]
 
 
@@ -22,48 +29,96 @@ def classify(sim):
     return "new"
 
 
+_WS_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=8192)
 def normalize_claim_text(t):
+    if t.isascii():
+        # NFC is the identity on ASCII, and split() drops the same
+        # whitespace \s matches, so split/join gives the same result.
+        return " ".join(t.lower().split())
     t = unicodedata.normalize("NFC", t)
     t = t.strip().lower()
-    t = re.sub(r"\s+", " ", t)
+    t = _WS_RE.sub(" ", t)
     return t
 
 
+@lru_cache(maxsize=8192)
+def _claim_hashes(claim_text):
+    """(raw, normalized) content digests for a claim text, as bound against
+    the bytea claim.content_hash. Usually identical, since content_digest
+    already lowercases and collapses whitespace."""
+    return content_digest(claim_text), content_digest(normalize_claim_text(claim_text))
+
+
+# Upsert so a claim inserted concurrently since our SELECT resolves to its
+# claim_id instead of raising UniqueViolation. The no-op DO UPDATE (rather
+# than DO NOTHING) makes RETURNING yield the existing row; the embedding
+# backfills that row if it never got one.
+_INSERT_CLAIM_WITH_EMBEDDING = (
+    "WITH ins AS ("
+    "  INSERT INTO claim (claim_text, content_hash) VALUES (:t,:h) "
+    "  ON CONFLICT (content_hash) DO UPDATE SET content_hash = EXCLUDED.content_hash "
+    "  RETURNING claim_id"
+    "), emb AS ("
+    "  INSERT INTO claim_embedding (claim_id, embedding_model, embedding) "
+    "  SELECT claim_id, :m, :v FROM ins "
+    "  ON CONFLICT (claim_id) DO NOTHING"
+    ") "
+    "SELECT claim_id FROM ins"
+)
+
+
+# content_hash -> claim_id. Claims are never deleted and content_hash is
+# UNIQUE, so an entry can only go missing through eviction, never go stale.
+_CLAIM_ID_CACHE_MAX = 10_000
+_claim_id_cache: "OrderedDict[bytes, int]" = OrderedDict()
+_claim_id_lock = threading.Lock()
+
+
+def _cached_claim_id(h):
+    with _claim_id_lock:
+        cid = _claim_id_cache.get(h)
+        if cid is not None:
+            _claim_id_cache.move_to_end(h)
+        return cid
+
+
+def _remember_claim_id(h, cid):
+    with _claim_id_lock:
+        _claim_id_cache[h] = cid
+        _claim_id_cache.move_to_end(h)
+        if len(_claim_id_cache) > _CLAIM_ID_CACHE_MAX:
+            _claim_id_cache.popitem(last=False)
+
+
 def ensure_claim(db, claim_text):
     """Insert claim if not present. Returns claim_id."""
-    h = content_hash(claim_text)
-    row = db.execute(
-        text("SELECT claim_id FROM claim WHERE content_hash=:h"), {"h": h}
-    ).fetchone()
-    if row:
-        return int(row[0])
-
-    h_norm = content_hash(normalize_claim_text(claim_text))
-    if h_norm != h:
-        row = db.execute(
-            text("SELECT claim_id FROM claim WHERE content_hash=:h"),
-            {"h": h_norm},
-        ).fetchone()
-        if row:
-            return int(row[0])
+    h, h_norm = _claim_hashes(claim_text)
+    cid = _cached_claim_id(h)
+    if cid is not None:
+        return cid
+    hs = [h] if h_norm == h else [h, h_norm]
+    rows = db.execute(
+        text("SELECT claim_id, content_hash FROM claim WHERE content_hash = ANY(:hs)"),
+        {"hs": hs},
+    ).fetchall()
+    if rows:
+        # Prefer an exact raw-hash match over the normalized one
+        by_hash = {bytes(r[1]): int(r[0]) for r in rows}
+        cid = by_hash.get(h, by_hash.get(h_norm))
+        _remember_claim_id(h, cid)
+        return cid
 
+    vec = embed(claim_text)
     row = db.execute(
-        text(
-            "INSERT INTO claim (claim_text, content_hash) "
-            "VALUES (:t,:h) RETURNING claim_id"
-        ),
-        {"t": claim_text, "h": h},
+        text(_INSERT_CLAIM_WITH_EMBEDDING),
+        {"t": claim_text, "h": h, "m": EMBEDDINGS_MODEL, "v": vec},
     ).fetchone()
-    cid = int(row[0])
-    vec = embed(claim_text)
-    db.execute(
-        text(
-            "INSERT INTO claim_embedding "
-            "(claim_id, embedding_model, embedding) VALUES (:id,:m,:v)"
-        ),
-        {"id": cid, "m": EMBEDDINGS_MODEL, "v": vec},
-    )
     db.commit()
+    cid = int(row[0])
+    _remember_claim_id(h, cid)
     return cid
 
 
@@ -78,28 +133,28 @@ def get_post_id(db, claim_id):
     return None
 
 
+# The query vector is a scalar subquery (an InitPlan parameter), not a
+# CROSS JOIN column, so the ORDER BY can use idx_claim_embedding_hnsw.
+_KNN_SQL = text(
+    "SELECT c.claim_id, c.claim_text, s.similarity "
+    "FROM (SELECT e.claim_id, "
+    "        1.0 - (e.embedding <=> (SELECT embedding FROM claim_embedding WHERE claim_id = :id)) AS similarity "
+    "      FROM claim_embedding e "
+    "      WHERE e.claim_id != :id "
+    "      ORDER BY e.embedding <=> (SELECT embedding FROM claim_embedding WHERE claim_id = :id) "
+    "      LIMIT :k) s "
+    "JOIN claim c USING (claim_id) "
+    "ORDER BY s.similarity DESC"
+)
+
+
 def compute_one(db, claim_text, top_k=5):
     cid = ensure_claim(db, claim_text)
     post_id = get_post_id(db, cid)
 
     similar = []
     try:
-        rows = db.execute(
-            text(
-                "WITH q AS ("
-                "  SELECT embedding FROM claim_embedding WHERE claim_id=:id"
-                ") "
-                "SELECT c.claim_id, c.claim_text, "
-                "  (1.0 - (e.embedding <=> q.embedding)) AS similarity "
-                "FROM claim c "
-                "JOIN claim_embedding e USING (claim_id) "
-                "CROSS JOIN q "
-                "WHERE c.claim_id != :id "
-                "ORDER BY (e.embedding <=> q.embedding) ASC "
-                "LIMIT :k"
-            ),
-            {"id": cid, "k": top_k},
-        ).fetchall()
+        rows = db.execute(_KNN_SQL, {"id": cid, "k": top_k}).fetchall()
         similar = [
             {"claim_id": int(r[0]), "text": str(r[1]), "similarity": float(r[2])}
             for r in rows
@@ -119,17 +174,29 @@ def compute_one(db, claim_text, top_k=5):
             ),
             {"id": cid},
         ).fetchall()
-        for ocid, txt, emb_val in rows:
-            avec = decode_embedding(db, emb_val) or []
-            sim = cosine_similarity(qvec, avec) if qvec and avec else 0.0
-            similar.append(
-                {"claim_id": int(ocid), "text": str(txt), "similarity": float(sim)}
-            )
-        similar.sort(key=lambda x: x["similarity"], reverse=True)
-        similar = similar[:top_k]
+        # Score every row with one matmul; rows without a usable embedding
+        # keep similarity 0.0. Only the top_k are sorted.
+        sims = np.zeros(len(rows), dtype=np.float32)
+        if qvec:
+            vecs = [decode_embedding(db, r[2]) or [] for r in rows]
+            valid = [i for i, v in enumerate(vecs) if len(v) == len(qvec)]
+            if valid:
+                sims[valid] = cosine_similarities(qvec, [vecs[i] for i in valid])
+        k = min(top_k, len(rows))
+        if k > 0:
+            top = np.argpartition(-sims, k - 1)[:k]
+            top = top[np.argsort(-sims[top], kind="stable")]
+            similar = [
+                {"claim_id": int(rows[i][0]), "text": str(rows[i][1]),
+                 "similarity": float(sims[i])}
+                for i in top
+            ]
+
+    return _result(claim_text, cid, post_id, similar)
 
-    max_sim = float(similar[0]["similarity"]) if similar else 0.0
 
+def _result(claim_text, cid, post_id, similar):
+    max_sim = float(similar[0]["similarity"]) if similar else 0.0
     return {
         "hash": content_hash(claim_text),
         "claim_id": cid,
@@ -139,8 +206,118 @@ def compute_one(db, claim_text, top_k=5):
         "similar": similar,
     }
 
+
+def ensure_claims(db, claim_texts):
+    """Batch variant of ensure_claim(). Returns claim_ids aligned with
+    claim_texts. Existing claims are resolved with one SELECT and all
+    missing claims are embedded with a single embed_batch() call."""
+    pairs = [_claim_hashes(t) for t in claim_texts]
+    hashes = [p[0] for p in pairs]
+    norm_hashes = [p[1] for p in pairs]
+    rows = db.execute(
+        text("SELECT content_hash, claim_id FROM claim WHERE content_hash = ANY(:hs)"),
+        {"hs": list(set(hashes) | set(norm_hashes))},
+    ).fetchall()
+    by_hash = {bytes(r[0]): int(r[1]) for r in rows}
+
+    missing = {}  # hash -> text (first occurrence wins)
+    for t, h, hn in zip(claim_texts, hashes, norm_hashes):
+        if h not in by_hash and hn not in by_hash:
+            missing.setdefault(h, t)
+
+    if missing:
+        vecs = embed_batch(list(missing.values()))
+        for (h, t), vec in zip(missing.items(), vecs):
+            row = db.execute(
+                text(_INSERT_CLAIM_WITH_EMBEDDING),
+                {"t": t, "h": h, "m": EMBEDDINGS_MODEL, "v": vec},
+            ).fetchone()
+            by_hash[h] = int(row[0])
+        db.commit()
+
+    return [by_hash[h] if h in by_hash else by_hash[hn]
+            for h, hn in zip(hashes, norm_hashes)]
+
+
+def compute_many(db, claim_texts, top_k=5):
+    """Batch variant of compute_one(). Returns results aligned with claim_texts.
+
+    All texts are ensured/embedded in one pass and the top-k neighbours of
+    every claim come back from a single grouped pgvector query
+    (unnest + LATERAL kNN), instead of one round trip per claim.
+    """
+    if not claim_texts:
+        return []
+    try:
+        cids = ensure_claims(db, claim_texts)
+        unique_ids = list(dict.fromkeys(cids))
+
+        post_ids = {
+            int(r[0]): (int(r[1]) if r[1] is not None else None)
+            for r in db.execute(
+                text("SELECT claim_id, post_id FROM claim WHERE claim_id = ANY(:ids)"),
+                {"ids": unique_ids},
+            ).fetchall()
+        }
+
+        rows = db.execute(
+            text(
+                "SELECT q.claim_id, s.claim_id, s.claim_text, s.similarity "
+                "FROM unnest(CAST(:ids AS bigint[])) AS q(claim_id) "
+                "JOIN claim_embedding qe ON qe.claim_id = q.claim_id "
+                "CROSS JOIN LATERAL ("
+                "  SELECT c.claim_id, c.claim_text, "
+                "    (1.0 - (e.embedding <=> qe.embedding)) AS similarity "
+                "  FROM claim c "
+                "  JOIN claim_embedding e USING (claim_id) "
+                "  WHERE c.claim_id != q.claim_id "
+                "  ORDER BY (e.embedding <=> qe.embedding) ASC "
+                "  LIMIT :k"
+                ") s "
+                "ORDER BY q.claim_id, s.similarity DESC"
+            ),
+            {"ids": unique_ids, "k": top_k},
+        ).fetchall()
+        similar_by_id = {cid: [] for cid in unique_ids}
+        for qid, ocid, txt, sim in rows:
+            similar_by_id[int(qid)].append(
+                {"claim_id": int(ocid), "text": str(txt), "similarity": float(sim)}
+            )
+    except Exception as e:
+        logger.warning("compute_many batched path failed (%s); falling back to compute_one", e)
+        db.rollback()
+        cache = {}
+        for t in claim_texts:
+            if t not in cache:
+                cache[t] = compute_one(db, t, top_k=top_k)
+        return [cache[t] for t in claim_texts]
+
+    return [
+        _result(t, cid, post_ids.get(cid), list(similar_by_id.get(cid, [])))
+        for t, cid in zip(claim_texts, cids)
+    ]
+
 OVERLAY_THRESHOLD = 0.82
 
+# kNN over the on-chain subset only. The post_id_present flag lets Postgres
+# use the partial HNSW index (migration 190) instead of scanning every
+# embedding and filtering afterwards; the query vector is a scalar subquery
+# so the ORDER BY is an index-orderable "column <=> constant" expression.
+# The similarity cutoff is applied to the k nearest, outside the index scan,
+# so rows under it are never shipped back.
+_ONCHAIN_KNN_SQL = text(
+    "SELECT c.claim_id, c.claim_text, c.post_id, s.similarity "
+    "FROM (SELECT e.claim_id, "
+    "        1.0 - (e.embedding <=> (SELECT embedding FROM claim_embedding WHERE claim_id = :id)) AS similarity "
+    "      FROM claim_embedding e "
+    "      WHERE e.post_id_present AND e.claim_id != :id "
+    "      ORDER BY e.embedding <=> (SELECT embedding FROM claim_embedding WHERE claim_id = :id) "
+    "      LIMIT :k) s "
+    "JOIN claim c USING (claim_id) "
+    "WHERE c.post_id IS NOT NULL AND s.similarity >= :min_sim "
+    "ORDER BY s.similarity DESC"
+)
+
 def find_best_onchain_match(db, sentence_text, exclude_post_ids=None):
     """Find the best on-chain claim matching a sentence by embedding similarity."""
     if not sentence_text or not sentence_text.strip():
@@ -160,22 +337,13 @@ def find_best_onchain_match(db, sentence_text, exclude_post_ids=None):
     # Strategy 2: embedding similarity
     try:
         cid = ensure_claim(db, sentence_text)
-        rows = db.execute(text(
-            "WITH q AS (SELECT embedding FROM claim_embedding WHERE claim_id = :id) "
-            "SELECT c.claim_id, c.claim_text, c.post_id, "
-            "  (1.0 - (e.embedding <=> q.embedding)) AS similarity "
-            "FROM claim c JOIN claim_embedding e USING (claim_id) CROSS JOIN q "
-            "WHERE c.claim_id != :id AND c.post_id IS NOT NULL "
-            "ORDER BY (e.embedding <=> q.embedding) ASC LIMIT 5"
-        ), {"id": cid}).fetchall()
+        rows = db.execute(_ONCHAIN_KNN_SQL, {"id": cid, "k": 5, "min_sim": OVERLAY_THRESHOLD}).fetchall()
         for r in rows:
             pid = int(r[2])
-            sim = float(r[3])
             if pid in exclude_post_ids:
                 continue
-            if sim >= OVERLAY_THRESHOLD:
-                return {"claim_id": int(r[0]), "claim_text": str(r[1]),
-                        "post_id": pid, "similarity": sim}
+            return {"claim_id": int(r[0]), "claim_text": str(r[1]),
+                    "post_id": pid, "similarity": float(r[3])}
     except Exception as e:
         logger.debug(f"Embedding match failed: {e}")
 
@@ -188,17 +356,10 @@ def find_all_onchain_matches(db, sentence_text, top_k=3):
         return []
     try:
         cid = ensure_claim(db, sentence_text)
-        rows = db.execute(text(
-            "WITH q AS (SELECT embedding FROM claim_embedding WHERE claim_id = :id) "
-            "SELECT c.claim_id, c.claim_text, c.post_id, "
-            "  (1.0 - (e.embedding <=> q.embedding)) AS similarity "
-            "FROM claim c JOIN claim_embedding e USING (claim_id) CROSS JOIN q "
-            "WHERE c.claim_id != :id AND c.post_id IS NOT NULL "
-            "ORDER BY (e.embedding <=> q.embedding) ASC LIMIT :k"
-        ), {"id": cid, "k": top_k}).fetchall()
+        rows = db.execute(_ONCHAIN_KNN_SQL, {"id": cid, "k": top_k, "min_sim": OVERLAY_THRESHOLD}).fetchall()
         return [{"claim_id": int(r[0]), "claim_text": str(r[1]),
                  "post_id": int(r[2]), "similarity": float(r[3])}
-                for r in rows if float(r[3]) >= OVERLAY_THRESHOLD]
+                for r in rows]
     except Exception as e:
         logger.debug(f"find_all_onchain_matches failed: {e}")
         return []
@@ -4,3 +4,15 @@ def cosine_similarity(a, b) -> float:
     na = np.linalg.norm(a); nb = np.linalg.norm(b)
     if na == 0.0 or nb == 0.0: return 0.0
     return float(np.dot(a,b)/(na*nb))
+
+def cosine_similarities(q, vecs) -> np.ndarray:
+    """Cosine similarity of q against every row of vecs in one matmul.
+    Zero-norm rows (or a zero q) score 0.0, as in cosine_similarity."""
+    m = np.asarray(vecs, dtype=np.float32)
+    qv = np.asarray(q, dtype=np.float32)
+    nq = np.linalg.norm(qv)
+    if m.size == 0 or nq == 0.0:
+        return np.zeros(len(m), dtype=np.float32)
+    norms = np.linalg.norm(m, axis=1)
+    norms[norms == 0.0] = np.inf
+    return (m @ qv) / (norms * nq)
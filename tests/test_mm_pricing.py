@@ -6,6 +6,7 @@ These test the mathematical properties of the pricing curves,
 NOT the API routes or on-chain transfers.
 """
 import math
+import numpy as np
 import pytest
 from unittest.mock import patch
 
@@ -24,6 +25,8 @@ def _mock_oracle():
 from mm.mm_pricing import (
     _base_price,
     _reserve_price,
+    _integrate_buy_cost,
+    _integrate_sell_proceeds,
     get_spot_quote,
     compute_buy_fill,
     compute_sell_fill,
@@ -88,6 +91,52 @@ class TestReserveCurve:
         assert _reserve_price(-100, 10000, 0) == 0.0
 
 
+# ────────────────────────────────────────────────────────────
+# Closed-form integrals vs. numerical integration
+# ────────────────────────────────────────────────────────────
+
+def _trapezoid(f, a, b, steps=20_000):
+    h = (b - a) / steps
+    return sum((f(a + i * h) + f(a + (i + 1) * h)) / 2 * h for i in range(steps))
+
+
+class TestClosedFormIntegrals:
+    @pytest.mark.parametrize("n_start,qty", [(0, 10), (100, 500), (10_000, 1)])
+    def test_buy_matches_numeric(self, n_start, qty):
+        exact = _integrate_buy_cost(n_start, qty, MOCK_GOLD, DEFAULT_UNIT_AU, DEFAULT_HALF_SPREAD)
+        numeric = _trapezoid(
+            lambda n: _base_price(n, MOCK_GOLD, DEFAULT_UNIT_AU) * (1 + DEFAULT_HALF_SPREAD),
+            n_start, n_start + qty,
+        )
+        assert exact == pytest.approx(numeric, rel=1e-8)
+
+    def test_sell_in_reserve_territory_matches_numeric(self):
+        r, c = 100_000.0, 50_000.0
+        exact = _integrate_sell_proceeds(-100, 60_000, MOCK_GOLD, DEFAULT_UNIT_AU,
+                                         DEFAULT_HALF_SPREAD, r, c)
+        numeric = _trapezoid(
+            lambda n: _reserve_price(n, r, c) * (1 - DEFAULT_HALF_SPREAD),
+            -60_100, -100,
+        )
+        assert exact == pytest.approx(numeric, rel=1e-8)
+
+    def test_sell_past_full_drain_adds_nothing(self):
+        """Below n = -vsp_circulating the reserve price is zero, so the
+        proceeds are the full triangle floor * S / 2 however far the sell goes."""
+        r, c = 100_000.0, 50_000.0
+        args = (MOCK_GOLD, DEFAULT_UNIT_AU, DEFAULT_HALF_SPREAD, r, c)
+        triangle = (r / c) * c / 2 * (1 - DEFAULT_HALF_SPREAD)
+        assert _integrate_sell_proceeds(0, c, *args) == pytest.approx(triangle, rel=1e-12)
+        assert _integrate_sell_proceeds(0, 10 * c, *args) == pytest.approx(triangle, rel=1e-12)
+
+    def test_sell_splits_at_zero(self):
+        r, c = 100_000.0, 50_000.0
+        args = (MOCK_GOLD, DEFAULT_UNIT_AU, DEFAULT_HALF_SPREAD, r, c)
+        whole = _integrate_sell_proceeds(50, 100, *args)
+        parts = _integrate_sell_proceeds(50, 50, *args) + _integrate_sell_proceeds(0, 50, *args)
+        assert whole == pytest.approx(parts, rel=1e-12)
+
+
 # ────────────────────────────────────────────────────────────
 # Volume-integrated fills: spread invariant
 # ────────────────────────────────────────────────────────────
@@ -95,23 +144,31 @@ class TestReserveCurve:
 class TestSpreadInvariant:
     """The core property: buy then immediately sell the same qty always loses money."""
 
-    @pytest.mark.parametrize("net_vsp", [0, 10, 100, 1000, 10000])
-    @pytest.mark.parametrize("qty", [1, 10, 100, 500])
-    def test_round_trip_always_loses(self, net_vsp, qty):
+    def test_round_trip_always_loses(self):
         reserves = 100_000.0
         circ = 50_000.0
 
-        buy = compute_buy_fill(net_vsp, qty, reserves, circ)
-        # After buying, net_vsp increases, reserves increase
-        sell = compute_sell_fill(
-            buy.new_net_vsp, qty,
-            reserves + buy.total_usd,  # reserves grew from the buy
-            circ + qty,
-        )
+        # Sweep net_vsp x qty in one test; the math is trivial next to
+        # per-case pytest setup.
+        net_grid, qty_grid = np.meshgrid([0, 10, 100, 1000, 10000], [1, 10, 100, 500])
+        buys = np.empty(net_grid.shape)
+        sells = np.empty(net_grid.shape)
+        for idx, (net_vsp, qty) in enumerate(zip(net_grid.flat, qty_grid.flat)):
+            buy = compute_buy_fill(int(net_vsp), int(qty), reserves, circ)
+            # After buying, net_vsp increases, reserves increase
+            sell = compute_sell_fill(
+                buy.new_net_vsp, int(qty),
+                reserves + buy.total_usd,  # reserves grew from the buy
+                circ + qty,
+            )
+            buys.flat[idx] = buy.total_usd
+            sells.flat[idx] = sell.total_usd
+
         # Cost to buy must exceed proceeds from selling
-        assert buy.total_usd > sell.total_usd, (
-            f"Round trip profit at net_vsp={net_vsp}, qty={qty}: "
-            f"buy={buy.total_usd:.6f}, sell={sell.total_usd:.6f}"
+        np.testing.assert_array_less(
+            sells, buys,
+            err_msg=f"Round trip profit; rows qty={qty_grid[:, 0].tolist()}, "
+                    f"cols net_vsp={net_grid[0].tolist()}",
         )
 
     def test_large_buy_pumps_price_but_spread_protects(self):